@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Local LRU cache for audio assets
+
+Dropbox-synced folders (and network mirrors) are slow to read repeatedly,
+so sessions can stage the assets they use onto fast local disk. Cached
+files are stored by checksum under development.cache_location, verified
+against the manifest checksum when staged, and evicted least-recently-used
+first once the cache grows past development.cache_size_limit.
+"""
+
+import os
+import json
+import time
+import atexit
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from asset_io import atomic_write, copy_and_hash, parse_size
+
+INDEX_FILE = 'index.json'
+
+
+class AssetCache:
+    """Size-bounded, checksum-keyed cache of asset files on local disk"""
+
+    def __init__(self, cache_dir: str = '.cache/audio_assets', size_limit='5GB'):
+        self.cache_dir = cache_dir
+        self.size_limit = parse_size(size_limit)
+        self.index_path = os.path.join(cache_dir, INDEX_FILE)
+        self.dirty = False
+        # checksum -> {'size': bytes, 'last_used': epoch seconds}, oldest first
+        self.entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._load_index()
+        atexit.register(self.save)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['AssetCache']:
+        """Build the cache described by the ``development`` config block, or None if disabled"""
+        development = (config or {}).get('development', {}) or {}
+        if not development.get('cache_enabled', False):
+            return None
+        return cls(development.get('cache_location', '.cache/audio_assets'),
+                   development.get('cache_size_limit', '5GB'))
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            entries = {}
+        for checksum, entry in sorted(entries.items(), key=lambda item: item[1]['last_used']):
+            self.entries[checksum] = entry
+
+    def save(self):
+        """Persist the index if anything changed"""
+        if not self.dirty:
+            return
+        with atomic_write(self.index_path) as f:
+            json.dump(self.entries, f, separators=(',', ':'))
+        self.dirty = False
+
+    def path(self, checksum: str) -> str:
+        return os.path.join(self.cache_dir, checksum[:2], checksum)
+
+    @property
+    def total_size(self) -> int:
+        return sum(entry['size'] for entry in self.entries.values())
+
+    def lookup(self, checksum: str) -> Optional[str]:
+        """Return the cached path for a checksum and mark it recently used"""
+        if checksum not in self.entries:
+            return None
+        cached_path = self.path(checksum)
+        if not os.path.exists(cached_path):
+            # Removed behind our back; forget it
+            del self.entries[checksum]
+            self.dirty = True
+            return None
+        self.entries[checksum]['last_used'] = time.time()
+        self.entries.move_to_end(checksum)
+        self.dirty = True
+        return cached_path
+
+    def stage(self, source_path: str, checksum: str) -> str:
+        """Return a local copy of source_path, copying it into the cache if needed
+
+        Raises ValueError if the copied bytes do not match ``checksum``.
+        """
+        cached_path = self.lookup(checksum)
+        if cached_path:
+            return cached_path
+
+        cached_path = self.path(checksum)
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+        # Hardlinks would tie the cache to the synced file's inode
+        _, actual_checksum = copy_and_hash(source_path, cached_path, allow_hardlink=False)
+        if actual_checksum != checksum:
+            os.unlink(cached_path)
+            raise ValueError(f"Checksum mismatch while caching {source_path}")
+
+        self.entries[checksum] = {'size': os.path.getsize(cached_path), 'last_used': time.time()}
+        self.dirty = True
+        self.evict(keep=checksum)
+        self.save()
+        return cached_path
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Remove least-recently-used files until the cache fits its limit; return bytes freed"""
+        freed = 0
+        total = self.total_size
+        for checksum in list(self.entries):
+            if total <= self.size_limit:
+                break
+            if checksum == keep:
+                continue
+            size = self.entries.pop(checksum)['size']
+            try:
+                os.unlink(self.path(checksum))
+            except FileNotFoundError:
+                pass
+            total -= size
+            freed += size
+            self.dirty = True
+        return freed
+
+    def clear(self) -> int:
+        """Remove every cached file; return bytes freed"""
+        limit, self.size_limit = self.size_limit, -1
+        try:
+            freed = self.evict()
+        finally:
+            self.size_limit = limit
+        self.save()
+        return freed
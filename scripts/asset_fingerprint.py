@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Acoustic fingerprints for finding near-duplicate recordings
+
+SHA256 only matches byte-identical files; re-exports of the same take
+(another sample rate, bit depth, gain or trim) hash differently. Here each
+recording is reduced to a set of spectral-peak pair hashes:
+
+- the mono mix is analysed with ~128 ms frames every ~32 ms, sized in
+  seconds rather than samples so every sample rate lands on the same grid,
+  and only bins below 4 kHz are kept (a downsampled spectrogram)
+- local maxima of the log spectrogram become peaks (a few per frame)
+- each peak is paired with the next few peaks, and (f1, f2, dt) is packed
+  into a 24-bit hash stored with the anchor's frame offset
+
+Fingerprints are stored per checksum in one compact .npz index. To find
+duplicates, each recording's hashes are looked up with binary search in
+the index-wide sorted hash array, and matches vote for (other recording,
+time offset). Cost grows with the number of matching hashes, not with the
+number of recordings, so no pairwise comparison is needed.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from asset_io import DEFAULT_JOBS, atomic_write
+from audio_decode import read_audio
+
+DEFAULT_INDEX = ".cache/fingerprints.npz"
+
+FRAME_SECONDS = 0.128
+MAX_FREQ = 4000                 # Hz; 512 bins of ~7.8 Hz
+DYNAMIC_RANGE = np.log(1000.0)  # ignore peaks more than 60 dB below the loudest
+PEAK_FREQ_RADIUS = 16           # bins
+PEAK_TIME_RADIUS = 4            # frames
+PEAKS_PER_FRAME = 4
+FAN_OUT = 10
+MAX_DT = 63                     # frames (~2 s); fits in 6 bits
+DELTA_TOLERANCE = 2             # frames of offset jitter between re-exports
+FFT_BLOCK = 256                 # frames per FFT batch, bounds memory on long files
+
+
+class Fingerprint(NamedTuple):
+    hashes: np.ndarray   # uint32
+    offsets: np.ndarray  # uint32, anchor frame of each hash
+
+
+class DuplicatePair(NamedTuple):
+    checksum_a: str
+    checksum_b: str
+    score: float         # aligned matching hashes / hashes of the shorter recording
+    matches: int
+
+
+def _spectrogram(mono: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Log-magnitude spectrogram below MAX_FREQ, shaped (frames, bins)"""
+    n_fft = int(round(sample_rate * FRAME_SECONDS))
+    hop = n_fft // 4
+    n_bins = min(int(MAX_FREQ * FRAME_SECONDS), n_fft // 2 + 1)
+    if len(mono) < n_fft:
+        return np.empty((0, n_bins), dtype=np.float32)
+
+    frames = sliding_window_view(mono, n_fft)[::hop]
+    window = np.hanning(n_fft).astype(np.float32)
+    spec = np.empty((len(frames), n_bins), dtype=np.float32)
+    for start in range(0, len(frames), FFT_BLOCK):
+        block = np.fft.rfft(frames[start:start + FFT_BLOCK] * window, axis=1)[:, :n_bins]
+        spec[start:start + FFT_BLOCK] = np.log(np.abs(block) + 1e-9)
+    return spec
+
+
+def _max_filter(a: np.ndarray, radius: int, axis: int) -> np.ndarray:
+    pad = [(0, 0), (0, 0)]
+    pad[axis] = (radius, radius)
+    padded = np.pad(a, pad, constant_values=-np.inf)
+    return sliding_window_view(padded, 2 * radius + 1, axis=axis).max(axis=-1)
+
+
+def _peaks(spec: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (frame, bin) of the strongest local maxima, at most PEAKS_PER_FRAME per frame"""
+    if spec.size == 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    local_max = _max_filter(_max_filter(spec, PEAK_FREQ_RADIUS, 1), PEAK_TIME_RADIUS, 0)
+    is_peak = (spec == local_max) & (spec > spec.max() - DYNAMIC_RANGE)
+    strength = np.where(is_peak, spec, -np.inf)
+
+    k = min(PEAKS_PER_FRAME, spec.shape[1])
+    top = np.argpartition(strength, -k, axis=1)[:, -k:]
+    frames = np.repeat(np.arange(spec.shape[0]), k)
+    bins = top.ravel()
+    keep = np.isfinite(strength[frames, bins])
+    frames, bins = frames[keep], bins[keep]
+    order = np.lexsort((bins, frames))
+    return frames[order], bins[order]
+
+
+def fingerprint_samples(samples: np.ndarray, sample_rate: int) -> Fingerprint:
+    """Fingerprint decoded audio shaped (frames,) or (frames, channels)"""
+    mono = samples.mean(axis=1) if samples.ndim == 2 else samples
+    frames, bins = _peaks(_spectrogram(mono.astype(np.float32, copy=False), sample_rate))
+
+    hashes, offsets = [], []
+    for k in range(1, FAN_OUT + 1):
+        anchor = np.arange(len(frames) - k)
+        dt = frames[anchor + k] - frames[anchor]
+        ok = (dt > 0) & (dt <= MAX_DT)
+        hashes.append((bins[anchor][ok] << 15) | (bins[anchor + k][ok] << 6) | dt[ok])
+        offsets.append(frames[anchor][ok])
+    return Fingerprint(np.concatenate(hashes).astype(np.uint32), np.concatenate(offsets).astype(np.uint32))
+
+
+def fingerprint_file(file_path: str) -> Fingerprint:
+    """Decode a file and fingerprint it"""
+    samples, sample_rate = read_audio(file_path)
+    return fingerprint_samples(samples, sample_rate)
+
+
+class FingerprintIndex:
+    """Fingerprints of many recordings, keyed by checksum and stored in one .npz file"""
+
+    def __init__(self, index_path: str = DEFAULT_INDEX):
+        self.index_path = index_path
+        self.checksums: List[str] = []
+        self.fingerprints: List[Fingerprint] = []
+        self.dirty = False
+        self._sorted = None
+        self._load()
+
+    def __len__(self):
+        return len(self.checksums)
+
+    def _load(self):
+        try:
+            with np.load(self.index_path) as data:
+                checksums, bounds = data['checksums'], data['bounds']
+                hashes, offsets = data['hashes'], data['offsets']
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            return
+        self.checksums = [str(checksum) for checksum in checksums]
+        self.fingerprints = [Fingerprint(hashes[start:end], offsets[start:end])
+                             for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def save(self):
+        """Write the index if anything changed"""
+        if not self.dirty:
+            return
+        bounds = np.cumsum([0] + [len(fp.hashes) for fp in self.fingerprints])
+        with atomic_write(self.index_path, 'wb') as f:
+            np.savez(f,
+                     checksums=np.array(self.checksums, dtype='U64'),
+                     bounds=bounds.astype(np.int64),
+                     hashes=np.concatenate([fp.hashes for fp in self.fingerprints] or [np.empty(0, np.uint32)]),
+                     offsets=np.concatenate([fp.offsets for fp in self.fingerprints] or [np.empty(0, np.uint32)]))
+        self.dirty = False
+
+    def update(self, paths: Dict[str, str], keep: Optional[Set[str]] = None, jobs: Optional[int] = None,
+               progress: Callable[[str, Optional[str]], None] = None) -> List[str]:
+        """Fingerprint checksums not yet indexed and drop ones no longer wanted
+
+        ``paths`` maps checksum -> readable file; indexed checksums outside
+        ``keep`` (default: the keys of ``paths``) are dropped. Returns
+        checksums that could not be decoded; ``progress(checksum, error)``
+        is called per file.
+        """
+        wanted = keep if keep is not None else paths.keys()
+        keep = [i for i, checksum in enumerate(self.checksums) if checksum in wanted]
+        if len(keep) != len(self.checksums):
+            self.checksums = [self.checksums[i] for i in keep]
+            self.fingerprints = [self.fingerprints[i] for i in keep]
+            self.dirty = True
+
+        known = set(self.checksums)
+        todo = [checksum for checksum in paths if checksum not in known]
+
+        def work(checksum):
+            try:
+                return checksum, fingerprint_file(paths[checksum]), None
+            except (OSError, ValueError, RuntimeError) as e:
+                return checksum, None, str(e)
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=max(1, jobs or DEFAULT_JOBS)) as pool:
+            for checksum, fingerprint, error in pool.map(work, todo):
+                if fingerprint is None:
+                    failed.append(checksum)
+                else:
+                    self.checksums.append(checksum)
+                    self.fingerprints.append(fingerprint)
+                    self.dirty = True
+                if progress:
+                    progress(checksum, error)
+        self._sorted = None
+        return failed
+
+    def _sorted_view(self):
+        """All hashes sorted, with the owning recording and offset of each"""
+        if self._sorted is None:
+            hashes = np.concatenate([fp.hashes for fp in self.fingerprints] or [np.empty(0, np.uint32)])
+            offsets = np.concatenate([fp.offsets for fp in self.fingerprints] or [np.empty(0, np.uint32)])
+            owners = np.repeat(np.arange(len(self.fingerprints), dtype=np.int64),
+                               [len(fp.hashes) for fp in self.fingerprints])
+            order = np.argsort(hashes, kind='stable')
+            self._sorted = (hashes[order], owners[order], offsets[order].astype(np.int64))
+        return self._sorted
+
+    def matches(self, fingerprint: Fingerprint, max_bucket: int = 256) -> Dict[int, int]:
+        """Return {recording position: aligned matching hashes} for one fingerprint
+
+        Hashes shared by more than ``max_bucket`` entries (silence, hum)
+        carry little information and are skipped.
+        """
+        sorted_hashes, owners, offsets = self._sorted_view()
+        lo = np.searchsorted(sorted_hashes, fingerprint.hashes, 'left')
+        hi = np.searchsorted(sorted_hashes, fingerprint.hashes, 'right')
+        counts = hi - lo
+        keep = (counts > 0) & (counts <= max_bucket)
+        lo, counts = lo[keep], counts[keep]
+        if not len(lo):
+            return {}
+
+        # Expand each [lo, hi) run into individual positions
+        starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+        positions = starts + np.arange(counts.sum())
+        query_offsets = np.repeat(fingerprint.offsets[keep].astype(np.int64), counts)
+        deltas = (offsets[positions] - query_offsets) // DELTA_TOLERANCE
+
+        # Votes per (recording, time offset); the best offset is the alignment
+        keys = owners[positions] * (1 << 32) + (deltas + (1 << 31))
+        unique_keys, votes = np.unique(keys, return_counts=True)
+        recordings = unique_keys >> 32
+        boundaries = np.flatnonzero(np.diff(recordings)) + 1
+        group_starts = np.concatenate(([0], boundaries))
+        best = np.maximum.reduceat(votes, group_starts)
+        return dict(zip(recordings[group_starts].tolist(), best.tolist()))
+
+    def near_duplicates(self, threshold: float = 0.2, min_matches: int = 10) -> List[DuplicatePair]:
+        """Find pairs of indexed recordings whose fingerprints overlap by at least ``threshold``"""
+        pairs = []
+        for i, fingerprint in enumerate(self.fingerprints):
+            for j, votes in self.matches(fingerprint).items():
+                if j <= i or votes < min_matches:
+                    continue
+                shorter = min(len(fingerprint.hashes), len(self.fingerprints[j].hashes))
+                score = votes / shorter if shorter else 0.0
+                if score >= threshold:
+                    pairs.append(DuplicatePair(self.checksums[i], self.checksums[j], round(min(score, 1.0), 3), votes))
+        return pairs
+
+
+def group_pairs(pairs: List[DuplicatePair]) -> List[List[str]]:
+    """Merge pairwise matches into groups of checksums (union-find)"""
+    parent: Dict[str, str] = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for pair in pairs:
+        parent[find(pair.checksum_a)] = find(pair.checksum_b)
+    groups: Dict[str, List[str]] = {}
+    for checksum in parent:
+        groups.setdefault(find(checksum), []).append(checksum)
+    return list(groups.values())
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Low-level file I/O helpers for the audio asset manager
+
+Hashing large recordings is the slowest part of asset management, so this
+module keeps the read loop tight (large reusable buffers, no per-chunk
+allocations) and spreads independent files across a thread pool.
+hashlib releases the GIL while digesting, so threads scale with the disk.
+Directory walks use os.scandir so each file costs a single DirEntry.
+Copies try the cheapest mechanism the filesystem offers before falling
+back to moving bytes through user space.
+"""
+
+import os
+import sys
+import json
+import time
+import errno
+import shutil
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# 1 MiB reads keep syscall overhead negligible on multi-GB files while
+# staying small enough to share a thread pool without memory pressure.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_JOBS = min(8, os.cpu_count() or 1)
+DEFAULT_STAT_CACHE = ".cache/asset_stat_cache.json"
+
+# Linux ioctl that shares extents between files (btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+# Errors meaning "this copy mechanism is not supported here", not real I/O failures
+_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                       errno.ENOTTY, errno.EBADF, errno.EPERM}
+
+
+_SIZE_UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'TB': 1024 ** 4}
+
+
+def parse_size(size) -> int:
+    """Convert a config size such as "5GB" or "512 MB" to bytes"""
+    if isinstance(size, (int, float)):
+        return int(size)
+    text = str(size).strip().upper().replace(' ', '')
+    for unit in sorted(_SIZE_UNITS, key=len, reverse=True):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * _SIZE_UNITS[unit])
+    return int(float(text))
+
+
+def hash_file(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """Calculate the SHA256 checksum of a file using one reusable buffer"""
+    sha256_hash = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            sha256_hash.update(view[:n])
+    return sha256_hash.hexdigest()
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w'):
+    """Open a temp file next to ``path`` and rename it over ``path`` on success
+
+    Readers see either the old or the new file, never a partial write.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _reflink(fsrc, fdst) -> bool:
+    """Clone src into dst with copy-on-write; True if the filesystem supports it"""
+    if not sys.platform.startswith('linux'):
+        return False
+    import fcntl
+    try:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        return True
+    except OSError as e:
+        if e.errno in _UNSUPPORTED_ERRNOS:
+            return False
+        raise
+
+
+def _kernel_copy(fsrc, fdst) -> Optional[str]:
+    """Copy inside the kernel with copy_file_range or sendfile; return the method used"""
+    size = os.fstat(fsrc.fileno()).st_size
+    for name in ('copy_file_range', 'sendfile'):
+        func = getattr(os, name, None)
+        if func is None:
+            continue
+        offset = 0
+        try:
+            while offset < size:
+                if name == 'copy_file_range':
+                    n = func(fsrc.fileno(), fdst.fileno(), size - offset, offset, offset)
+                else:
+                    n = func(fdst.fileno(), fsrc.fileno(), offset, size - offset)
+                if n == 0:
+                    break
+                offset += n
+            return name
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            # Start over with the next mechanism
+            fdst.seek(0)
+            fdst.truncate()
+    return None
+
+
+def _clone_into(src: str, dst: str, allow_hardlink: bool) -> Optional[str]:
+    """Try the metadata-only copies (reflink, then hardlink); return the method or None
+
+    On None, dst exists as an empty file ready for a byte copy.
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        if _reflink(fsrc, fdst):
+            shutil.copystat(src, dst)
+            return 'reflink'
+
+    if allow_hardlink:
+        os.unlink(dst)
+        try:
+            os.link(src, dst)
+            return 'hardlink'
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_ERRNOS | {errno.EMLINK}:
+                raise
+            open(dst, 'wb').close()
+    return None
+
+
+def _copy_into(src: str, dst: str, allow_hardlink: bool) -> str:
+    method = _clone_into(src, dst, allow_hardlink)
+    if method:
+        return method
+
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        method = _kernel_copy(fsrc, fdst)
+        if method is None:
+            shutil.copyfileobj(fsrc, fdst, DEFAULT_CHUNK_SIZE)
+            method = 'stream'
+    shutil.copystat(src, dst)
+    return method
+
+
+def _stream_copy_and_hash(src: str, dst: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """Copy src to dst through one reusable buffer, hashing each chunk as it is written"""
+    sha256_hash = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(src, 'rb', buffering=0) as fsrc, open(dst, 'wb') as fdst:
+        while True:
+            n = fsrc.readinto(buffer)
+            if not n:
+                break
+            sha256_hash.update(view[:n])
+            fdst.write(view[:n])
+    shutil.copystat(src, dst)
+    return sha256_hash.hexdigest()
+
+
+def _copy_and_hash_into(src: str, dst: str, allow_hardlink: bool) -> Tuple[str, str]:
+    method = _clone_into(src, dst, allow_hardlink)
+    if method:
+        # No bytes moved, so reading the source once is all the I/O there is
+        return method, hash_file(src)
+    # The checksum needs the bytes in user space anyway, so skip the
+    # in-kernel copies and hash while streaming: one read, one write
+    return 'stream', _stream_copy_and_hash(src, dst)
+
+
+def _replace_via_temp(dst: str, fill):
+    """Run fill(tmp_path) on a temp file beside dst, then rename it over dst"""
+    directory = os.path.dirname(dst) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(dst)}.", suffix='.tmp')
+    os.close(fd)
+    try:
+        result = fill(tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return result
+
+
+def copy_file(src: str, dst: str, allow_hardlink: bool = False) -> str:
+    """Copy src to dst with the cheapest mechanism available and return its name
+
+    Tries, in order: a copy-on-write reflink, a hardlink (if allowed), an
+    in-kernel copy_file_range/sendfile, then a plain buffered stream copy.
+    The copy is made in a temp file and renamed over dst, so dst is never
+    left half-written. Hardlinks are opt-in: they share the inode with src,
+    so later in-place edits of src show up in dst as well.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return 'in-place'
+    return _replace_via_temp(dst, lambda tmp_path: _copy_into(src, tmp_path, allow_hardlink))
+
+
+def copy_and_hash(src: str, dst: str, allow_hardlink: bool = False) -> Tuple[str, str]:
+    """Copy src to dst and return (method, SHA256 checksum)
+
+    Tries a reflink, then a hardlink (if allowed), then a streamed copy;
+    unlike copy_file it never uses copy_file_range/sendfile. The source is
+    read exactly once: reflinks and hardlinks hash the source directly,
+    the streamed copy hashes each chunk as it is written.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return 'in-place', hash_file(src)
+    return _replace_via_temp(dst, lambda tmp_path: _copy_and_hash_into(src, tmp_path, allow_hardlink))
+
+
+def link_or_copy(src: str, dst: str) -> str:
+    """Make dst refer to src as cheaply as possible and return the method used
+
+    Prefers a hardlink, then a symlink, and only copies (via copy_file)
+    when neither is possible.
+    """
+    if os.path.lexists(dst):
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            return 'existing'
+        os.unlink(dst)
+    try:
+        os.link(src, dst)
+        return 'hardlink'
+    except OSError:
+        pass
+    try:
+        os.symlink(os.path.abspath(src), dst)
+        return 'symlink'
+    except OSError:
+        pass
+    return copy_file(src, dst, allow_hardlink=False)
+
+
+class FileEntry(NamedTuple):
+    """A regular file found by walk_files"""
+    rel_path: str          # '/'-separated path relative to the walk root
+    path: str              # full filesystem path
+    stat: os.stat_result   # taken from the DirEntry, no extra lookup
+
+
+def _is_hidden(name: str) -> bool:
+    # Skip dotfiles such as .DS_Store and Dropbox's .dropbox.cache
+    return name.startswith('.')
+
+
+def walk_files(root: str, recursive: bool = True) -> Iterator[FileEntry]:
+    """Yield every regular file under root in a single scandir pass
+
+    File type comes from the DirEntry itself and size/mtime from one stat
+    per file, instead of separate listdir/isfile/getsize calls.
+    """
+    pending = [('', root)]
+    while pending:
+        prefix, dir_path = pending.pop()
+        try:
+            entries = os.scandir(dir_path)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        with entries:
+            for entry in entries:
+                if _is_hidden(entry.name):
+                    continue
+                rel_path = f"{prefix}{entry.name}"
+                try:
+                    if entry.is_file():
+                        yield FileEntry(rel_path, entry.path, entry.stat())
+                    elif recursive and entry.is_dir():
+                        pending.append((f"{rel_path}/", entry.path))
+                except OSError:
+                    # Entry disappeared between listing and stat (sync in progress)
+                    continue
+
+
+def list_subdirs(root: str) -> List[str]:
+    """Return the names of the visible directories directly under root"""
+    try:
+        with os.scandir(root) as entries:
+            return sorted(e.name for e in entries if not _is_hidden(e.name) and e.is_dir())
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return []
+
+
+class ChecksumEngine:
+    """Hash many files concurrently with large buffered reads"""
+
+    def __init__(self, jobs: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.jobs = max(1, jobs or DEFAULT_JOBS)
+        self.chunk_size = chunk_size
+
+    def checksum(self, file_path: str) -> str:
+        """Calculate the SHA256 checksum of a single file"""
+        return hash_file(file_path, self.chunk_size)
+
+    def _safe_checksum(self, file_path: str) -> Tuple[str, Optional[str]]:
+        try:
+            return file_path, self.checksum(file_path)
+        except OSError:
+            # File vanished or became unreadable mid-run (e.g. Dropbox sync)
+            return file_path, None
+
+    def iter_checksums(self, file_paths: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """Yield (path, checksum) pairs; checksum is None if the file could not be read"""
+        file_paths = list(file_paths)
+        if self.jobs == 1 or len(file_paths) <= 1:
+            for path in file_paths:
+                yield self._safe_checksum(path)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            yield from pool.map(self._safe_checksum, file_paths)
+
+    def checksum_many(self, file_paths: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Hash every file and return a {path: checksum} mapping"""
+        return dict(self.iter_checksums(file_paths))
+
+
+class StatCache:
+    """Persistent map of file stat fingerprints to previously computed checksums
+
+    An entry is reused only while the file's (size, mtime_ns, inode) still
+    match, so any rewrite, truncation or replacement forces a re-hash.
+    """
+
+    # Files modified this recently may still change within the same mtime
+    # tick, so their checksums are not cached (same idea as git's racy index).
+    RACY_WINDOW_NS = 2 * 10**9
+
+    def __init__(self, cache_path: str = DEFAULT_STAT_CACHE):
+        self.cache_path = cache_path
+        self.dirty = False
+        try:
+            with open(cache_path, 'r') as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def fingerprint(st: os.stat_result) -> list:
+        return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+    def get(self, file_path: str, st: os.stat_result) -> Optional[str]:
+        """Return the cached checksum if the file is unchanged, else None"""
+        entry = self.entries.get(os.path.abspath(file_path))
+        if entry and entry[0] == self.fingerprint(st):
+            return entry[1]
+        return None
+
+    def put(self, file_path: str, st: os.stat_result, checksum: str):
+        """Remember the checksum computed for the file in its current state"""
+        key = os.path.abspath(file_path)
+        if time.time_ns() - st.st_mtime_ns < self.RACY_WINDOW_NS:
+            self.entries.pop(key, None)
+        else:
+            self.entries[key] = [self.fingerprint(st), checksum]
+        self.dirty = True
+
+    def save(self):
+        """Write the cache atomically if anything changed"""
+        if not self.dirty:
+            return
+        with atomic_write(self.cache_path) as f:
+            json.dump(self.entries, f, separators=(',', ':'))
+        self.dirty = False
@@ -9,52 +9,224 @@ live in the synced Dropbox folder.
 Usage:
     python scripts/asset_manager.py verify
     python scripts/asset_manager.py list --category samples
-    python scripts/asset_manager.py register /path/to/audio/file.wav --category samples
+    python scripts/asset_manager.py register --file /path/to/audio/file.wav --category samples
+    python scripts/asset_manager.py register --file /path/to/recordings/ --category raw_recordings
+    python scripts/asset_manager.py register --files-from takes.txt --category raw_recordings
+    python scripts/asset_manager.py register --file /path/to/take.wav --category samples --verify
     python scripts/asset_manager.py scan --category samples
-    python scripts/asset_manager.py validate
+    python scripts/asset_manager.py validate --jobs 8
+    python scripts/asset_manager.py validate --full
+    python scripts/asset_manager.py export-manifest
+    python scripts/asset_manager.py import-manifest
+    python scripts/asset_manager.py cache --category samples
+    python scripts/asset_manager.py cache --clear
+    python scripts/asset_manager.py download --all
+    python scripts/asset_manager.py download --category samples --remote /mnt/avmi-audio-mirror
+    python scripts/asset_manager.py upload samples/new_take.wav
+    python scripts/asset_manager.py subset
+    python scripts/asset_manager.py watch
+    python scripts/asset_manager.py query --sample-rate 48000 --vehicle-type EV --min-duration 10
+    python scripts/asset_manager.py dupes
+    python scripts/asset_manager.py decode --category samples
 """
 
 import os
 import sys
-import yaml
-import hashlib
 import argparse
-import shutil
-from pathlib import Path
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from asset_query import AssetIndex, AssetQuery, AssetRecord
+    from asset_transfer import TransferJob
+
+# dropbox_path before the folder has been looked up (None means "not found")
+_UNRESOLVED = object()
 
 class AudioAssetManager:
-    def __init__(self, config_path: str = "config/assets.yaml"):
+    def __init__(self, config_path: str = "config/assets.yaml", jobs: Optional[int] = None,
+                 verify: bool = False):
         self.config_path = config_path
         self.manifest_path = "assets/manifest.yaml"
+        self.jobs = jobs
+        self.verify_copies = verify
         self.load_config()
-        self.load_manifest()
-        self.dropbox_path = self.find_dropbox_path()
+        # Helpers below are built on first use so that cheap commands stay cheap
+        self._hasher = None
+        self._stat_cache = None
+        self._store = None
+        self._blobs = None
+        self._cache = None
+        self._manifest = None
+        self._pending = None
+        self._index = None
+        self._indexed_manifest = None
+        self._decoded_cache = None
+        self._dropbox_path = _UNRESOLVED
+        dropbox_config = self.config.get('asset_storage', {}).get('dropbox_shared', {})
+        self.content_addressed = dropbox_config.get('storage_mode', 'files') == 'content_addressed'
+        self.allow_hardlinks = dropbox_config.get('allow_hardlinks', False)
+        mirror_config = self.config.get('asset_storage', {}).get('local_mirror', {}) or {}
+        self.mirror_path = os.path.expanduser(mirror_config['path']) if mirror_config.get('enabled') else None
     
     def load_config(self):
-        """Load asset management configuration"""
-        with open(self.config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        """Load asset management configuration (parsed once, then served from .cache/config)"""
+        from config_cache import load_cached_config
+        self.config = load_cached_config(self.config_path)
+    
+    @property
+    def dropbox_path(self) -> Optional[str]:
+        """Dropbox audio assets folder, looked up on first access"""
+        if self._dropbox_path is _UNRESOLVED:
+            self._dropbox_path = self.find_dropbox_path()
+        return self._dropbox_path
+    
+    @property
+    def hasher(self):
+        if self._hasher is None:
+            from asset_io import ChecksumEngine
+            self._hasher = ChecksumEngine(self.jobs)
+        return self._hasher
+    
+    @property
+    def stat_cache(self):
+        if self._stat_cache is None:
+            from asset_io import StatCache
+            self._stat_cache = StatCache()
+        return self._stat_cache
+    
+    @property
+    def store(self):
+        if self._store is None:
+            from manifest_store import open_manifest_store
+            self._store = open_manifest_store(self.config, self.manifest_path)
+            if getattr(self._store, 'reimported_yaml', False):
+                print(f"🔄 {self.manifest_path} changed since the last sync; reloaded the manifest database")
+            elif getattr(self._store, 'yaml_conflict', False):
+                print(f"⚠️ {self.manifest_path} changed since the last sync, and the manifest database has "
+                      f"local changes too. Run import-manifest to take the YAML (local changes are lost), "
+                      f"or export-manifest --force to overwrite it.")
+        return self._store
+    
+    @property
+    def blobs(self):
+        if self._blobs is None and self.dropbox_path:
+            from blob_store import BlobStore
+            self._blobs = BlobStore(self.dropbox_path)
+        return self._blobs
+    
+    @property
+    def cache(self):
+        if self._cache is None:
+            from asset_cache import AssetCache
+            self._cache = AssetCache.from_config(self.config)
+        return self._cache
+    
+    @property
+    def manifest(self) -> Dict:
+        """Full asset manifest, loaded from the store on first access"""
+        if self._manifest is None:
+            self.load_manifest()
+        return self._manifest
     
     def load_manifest(self):
         """Load asset manifest"""
-        try:
-            with open(self.manifest_path, 'r') as f:
-                self.manifest = yaml.safe_load(f)
-        except FileNotFoundError:
-            self.manifest = {
-                'version': '1.0',
-                'last_updated': datetime.now().isoformat(),
-                'dropbox_folder': 'AVMI-GVSC-Audio-Assets',
-                'categories': {}
-            }
+        self._manifest = self.store.load()
+        self._index = None
     
     def save_manifest(self):
         """Save updated manifest"""
-        self.manifest['last_updated'] = datetime.now().isoformat()
-        with open(self.manifest_path, 'w') as f:
-            yaml.dump(self.manifest, f, default_flow_style=False, indent=2)
+        self.store.save(self.manifest)
+    
+    def add_assets(self, category: str, assets: Dict[str, Dict]):
+        """Add or replace manifest entries in a category and persist them
+        
+        Incremental stores write only these entries, without loading the
+        rest of the manifest; the YAML store rewrites the whole file.
+        Inside a batch() block nothing is written until the block ends.
+        """
+        from manifest_store import new_category
+        # Incremental stores don't need the in-memory manifest unless it is already loaded
+        if self._manifest is not None or not self.store.incremental:
+            cat_data = self.manifest['categories'].setdefault(category, new_category(category))
+            cat_data.setdefault('assets', {}).update(assets)
+            cat_data['count'] = len(cat_data['assets'])
+        self._index = None
+        
+        if self._pending is not None:
+            self._pending.setdefault(category, {}).update(assets)
+        else:
+            self.store.put_assets(self._manifest, {category: assets})
+    
+    @contextmanager
+    def batch(self):
+        """Collect manifest changes and write them once, atomically, on exit
+        
+        If the block raises, pending changes are discarded and the manifest
+        is reloaded from the store on next access.
+        """
+        if self._pending is not None:
+            # Nested batch: the outermost block does the write
+            yield
+            return
+        
+        self._pending = {}
+        try:
+            yield
+        except BaseException:
+            self._manifest = None
+            raise
+        else:
+            if self._pending:
+                self.store.put_assets(self._manifest, self._pending)
+        finally:
+            self._pending = None
+    
+    @property
+    def index(self) -> 'AssetIndex':
+        """Query index over the manifest, built once and rebuilt only after changes"""
+        from asset_query import AssetIndex
+        manifest = self.manifest
+        # A reloaded manifest is a new object, so however it was reset the index follows it
+        if self._index is None or self._indexed_manifest is not manifest:
+            self._index = AssetIndex(manifest)
+            self._indexed_manifest = manifest
+        return self._index
+    
+    def query(self, query: 'AssetQuery' = None, **filters) -> List['AssetRecord']:
+        """Find assets by metadata, size or checksum
+        
+        Accepts an AssetQuery or its fields as keywords, e.g.
+        ``manager.query(sample_rate=48000, vehicle_type='EV', min_duration=10)``.
+        """
+        from asset_query import AssetQuery
+        return self.index.search(query._replace(**filters) if query else AssetQuery(**filters))
+    
+    def export_manifest(self, force: bool = False):
+        """Write the SQLite manifest out to the YAML file for git review"""
+        from manifest_store import SqliteManifestStore
+        if not isinstance(self.store, SqliteManifestStore):
+            print(f"💡 Manifest backend is YAML; {self.manifest_path} is already up to date")
+            return
+        try:
+            self.store.export_yaml(self.manifest_path, force=force)
+        except ValueError as e:
+            print(f"❌ Not exported: {e}")
+            return
+        print(f"✅ Exported manifest to {self.manifest_path}")
+    
+    def import_manifest(self):
+        """Reload the SQLite manifest from the YAML file (e.g. after git pull)"""
+        from manifest_store import SqliteManifestStore
+        if not isinstance(self.store, SqliteManifestStore):
+            print(f"💡 Manifest backend is YAML; {self.manifest_path} is used directly")
+            return
+        if self.store.import_yaml(self.manifest_path):
+            self._manifest = None
+            print(f"✅ Imported manifest from {self.manifest_path}")
+        else:
+            print(f"❌ Manifest not found: {self.manifest_path}")
     
     def find_dropbox_path(self) -> Optional[str]:
         """Find the Dropbox audio assets folder"""
@@ -116,19 +288,354 @@ class AudioAssetManager:
         
         return os.path.join(self.dropbox_path, category, filename)
     
+    def resolve_asset_path(self, category: str, filename: str, asset: Dict = None) -> str:
+        """Get the path holding an asset's bytes, following blob references"""
+        if asset is None:
+            asset = self.find_asset(category, filename) or {}
+        if asset.get('blob') and self.blobs:
+            return self.blobs.path(asset['blob'])
+        return self.get_asset_path(category, filename)
+    
+    def find_asset(self, category: str, filename: str) -> Optional[Dict]:
+        """Return the manifest entry for an asset, or None if untracked"""
+        return self.manifest['categories'].get(category, {}).get('assets', {}).get(filename)
+    
+    def source_asset_path(self, category: str, filename: str, asset: Dict = None) -> Optional[str]:
+        """Find a readable copy of an asset: the Dropbox folder first, then the local mirror"""
+        asset = asset or self.find_asset(category, filename) or {}
+        if self.dropbox_path:
+            path = self.resolve_asset_path(category, filename, asset)
+            if os.path.exists(path):
+                return path
+        if self.mirror_path:
+            rel_path = asset.get('dropbox_path') or f"{category}/{filename}"
+            path = os.path.join(self.mirror_path, rel_path)
+            if os.path.exists(path):
+                return path
+        return None
+    
+    def get_cached_asset_path(self, category: str, filename: str) -> str:
+        """Get a fast local path to an asset, staging it into the LRU cache if enabled"""
+        asset = self.find_asset(category, filename)
+        source_path = self.source_asset_path(category, filename, asset)
+        if not source_path:
+            raise FileNotFoundError(f"Audio asset not found: {category}/{filename}")
+        if not self.cache or not asset or not asset.get('checksum'):
+            return source_path
+        return self.cache.stage(source_path, asset['checksum'])
+    
+    def cache_assets(self, category: str = None):
+        """Stage tracked assets into the local cache"""
+        if not self.cache:
+            print("❌ Local cache is disabled (development.cache_enabled in config/assets.yaml)")
+            return
+        
+        categories = [category] if category else list(self.manifest['categories'])
+        hits = staged = failed = 0
+        for cat in categories:
+            for filename, asset in self.manifest['categories'].get(cat, {}).get('assets', {}).items():
+                if not asset.get('checksum'):
+                    continue
+                if self.cache.lookup(asset['checksum']):
+                    hits += 1
+                    continue
+                source_path = self.source_asset_path(cat, filename, asset)
+                if not source_path:
+                    print(f"  ⚠️ Not available locally: {cat}/{filename}")
+                    failed += 1
+                    continue
+                try:
+                    self.cache.stage(source_path, asset['checksum'])
+                    staged += 1
+                    print(f"  📥 Cached {cat}/{filename}")
+                except ValueError as e:
+                    print(f"  ❌ {e}")
+                    failed += 1
+        
+        self.cache.save()
+        print(f"✅ Cache: {staged} staged, {hits} already cached, {failed} failed")
+        self.cache_status()
+    
+    def cache_status(self):
+        """Print local cache usage"""
+        if not self.cache:
+            print("💡 Local cache is disabled (development.cache_enabled in config/assets.yaml)")
+            return
+        print(f"🗄  Cache: {self.cache.cache_dir}")
+        print(f"  {len(self.cache.entries)} files, "
+              f"{self.human_readable_size(self.cache.total_size)} of "
+              f"{self.human_readable_size(self.cache.size_limit)}")
+    
+    @property
+    def decoded_cache(self):
+        """Cache of decoded float32 arrays (imports NumPy on first use)"""
+        if self._decoded_cache is None:
+            from decoded_cache import DecodedCache
+            self._decoded_cache = DecodedCache.from_config(self.config)
+        return self._decoded_cache
+    
+    def load_audio(self, category: str, filename: str, sample_rate: int = None):
+        """Return an asset as a read-only float32 (frames, channels) memmap at the project rate
+        
+        The first call decodes and resamples the file into the decoded
+        cache; later calls only memory-map the cached array.
+        """
+        asset = self.find_asset(category, filename)
+        if not asset or not asset.get('checksum'):
+            raise FileNotFoundError(f"Audio asset not in manifest: {category}/{filename}")
+        cached = self.decoded_cache.load(asset['checksum'], sample_rate)
+        if cached is not None:
+            return cached
+        samples, _ = self.decoded_cache.decode(self.get_cached_asset_path(category, filename),
+                                               asset['checksum'], sample_rate)
+        return samples
+    
+    def decode_assets(self, category: str = None):
+        """Precompute decoded arrays for tracked audio assets"""
+        from audio_metadata import is_audio_file
+        cache = self.decoded_cache
+        todo = {}
+        for cat, cat_data in self.manifest['categories'].items():
+            if category and cat != category:
+                continue
+            for filename, asset in (cat_data.get('assets') or {}).items():
+                checksum = asset.get('checksum')
+                if not checksum or not is_audio_file(filename) or checksum in todo or cache.contains(checksum):
+                    continue
+                source_path = self.source_asset_path(cat, filename, asset)
+                if source_path:
+                    todo[checksum] = (source_path, f"{cat}/{filename}")
+                else:
+                    print(f"  ⚠️ Not available locally: {cat}/{filename}")
+        
+        print(f"🎚  Decoding {len(todo)} assets to float32 at {cache.sample_rate} Hz into {cache.cache_dir}")
+        errors = cache.decode_many(((path, checksum) for checksum, (path, _) in todo.items()), self.jobs)
+        failed = {checksum: error for checksum, error in errors.items() if error}
+        for checksum, error in failed.items():
+            print(f"  ⚠️ {todo[checksum][1]}: {error}")
+        print(f"✅ Decoded {len(todo) - len(failed)} assets "
+              f"({self.human_readable_size(cache.total_size)} cached)")
+    
     def calculate_checksum(self, file_path: str) -> str:
         """Calculate SHA256 checksum of a file"""
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(chunk)
-        return sha256_hash.hexdigest()
+        return self.hasher.checksum(file_path)
+    
+    def cached_checksum(self, file_path: str) -> str:
+        """Checksum a file, reusing the stat cache when it is unchanged"""
+        st = os.stat(file_path)
+        checksum = self.stat_cache.get(file_path, st)
+        if checksum is None:
+            checksum = self.calculate_checksum(file_path)
+            self.stat_cache.put(file_path, st, checksum)
+        return checksum
+    
+    def remote_endpoint(self, spec: str = None):
+        """Pick the remote side of a transfer: --remote, else the local mirror, else the cloud fallback"""
+        from asset_transfer import HttpEndpoint, LocalEndpoint, open_endpoint
+        if spec:
+            return open_endpoint(spec)
+        if self.mirror_path:
+            return LocalEndpoint(self.mirror_path)
+        cloud = self.config.get('asset_storage', {}).get('cloud_fallback', {}) or {}
+        base_url = cloud.get('base_url', '')
+        # The shipped base_url is a placeholder until a real folder id is filled in
+        if cloud.get('enabled') and base_url and '[' not in base_url:
+            return HttpEndpoint(base_url)
+        return None
+    
+    def _local_asset_root(self) -> str:
+        """Dropbox folder if present, otherwise the configured base_path (created on demand)"""
+        if self.dropbox_path:
+            return self.dropbox_path
+        base_path = self.config.get('asset_storage', {}).get('dropbox_shared', {}).get(
+            'base_path', '~/Dropbox/AVMI-GVSC-Audio-Assets')
+        return os.path.expanduser(base_path)
+    
+    def _transfer_jobs(self, category: str = None) -> List['TransferJob']:
+        """One job per distinct stored file among the tracked assets"""
+        from asset_transfer import TransferJob
+        categories = [category] if category else list(self.manifest['categories'])
+        jobs = {}
+        for cat in categories:
+            for filename, asset in self.manifest['categories'].get(cat, {}).get('assets', {}).items():
+                rel_path = asset.get('dropbox_path') or f"{cat}/{filename}"
+                jobs[rel_path] = TransferJob(rel_path, asset.get('checksum'), asset.get('size_bytes'))
+        return list(jobs.values())
+    
+    def _print_transfer_summary(self, results):
+        from asset_transfer import summarize
+        counts = summarize(results)
+        moved = sum(result.bytes for result in results)
+        print(f"✅ {counts.get('transferred', 0)} transferred, {counts.get('resumed', 0)} resumed, "
+              f"{counts.get('current', 0)} already current, {counts.get('failed', 0)} failed "
+              f"({self.human_readable_size(moved)} moved)")
+    
+    def materialize_subset(self, dest: str = None, remote: str = None) -> bool:
+        """Stage a budgeted development subset of assets, linking instead of copying where possible
+        
+        Uses development.dev_subset_size, dev_categories and dev_subset_location
+        from config/assets.yaml. The subset mirrors the Dropbox folder layout.
+        """
+        from asset_io import link_or_copy, parse_size
+        from asset_subset import collect_references, plan_subset
+        from asset_transfer import TransferEngine, TransferJob
+        development = self.config.get('development', {}) or {}
+        budget = parse_size(development.get('dev_subset_size', '1GB'))
+        categories = development.get('dev_categories', [])
+        dest_root = os.path.abspath(dest or development.get('dev_subset_location', '.cache/dev_subset'))
+        
+        references = collect_references()
+        selected, skipped = plan_subset(self.manifest, references, categories, budget)
+        print(f"🧩 Dev subset: {len(selected)} assets within {self.human_readable_size(budget)} "
+              f"({sum(item.referenced for item in selected)} referenced by mappings/instruments)")
+        
+        methods = {}
+        to_fetch = {}
+        for item in selected:
+            rel_path = item.asset.get('dropbox_path') or f"{item.category}/{item.filename}"
+            source_path = self.source_asset_path(item.category, item.filename, item.asset)
+            # Entries are exposed under their category/filename even when stored as blobs
+            dest_path = os.path.join(dest_root, item.category, item.filename)
+            if source_path:
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                method = link_or_copy(source_path, dest_path)
+                methods[method] = methods.get(method, 0) + 1
+            else:
+                to_fetch[rel_path] = TransferJob(rel_path, item.asset.get('checksum'), item.asset.get('size_bytes'))
+        
+        if to_fetch:
+            source = self.remote_endpoint(remote)
+            if source is None:
+                print(f"⚠️ {len(to_fetch)} assets are not available locally and no remote is configured")
+            else:
+                print(f"⬇️  Fetching {len(to_fetch)} assets from {source}")
+                results = TransferEngine(self.jobs, checksum_func=self.cached_checksum).fetch(
+                    source, dest_root, to_fetch.values())
+                fetched = {result.rel_path for result in results if result.status != 'failed'}
+                for item in selected:
+                    rel_path = item.asset.get('dropbox_path') or f"{item.category}/{item.filename}"
+                    if rel_path not in fetched:
+                        continue
+                    methods['download'] = methods.get('download', 0) + 1
+                    if rel_path != f"{item.category}/{item.filename}":
+                        # Blob-backed entry: expose it under its category/filename too
+                        dest_path = os.path.join(dest_root, item.category, item.filename)
+                        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                        link_or_copy(os.path.join(dest_root, *rel_path.split('/')), dest_path)
+        
+        summary = ', '.join(f"{count} {method}" for method, count in sorted(methods.items()))
+        print(f"✅ Subset staged at {dest_root} ({summary or 'nothing staged'})")
+        if skipped:
+            print(f"💡 {len(skipped)} candidate assets did not fit in the budget")
+        missing = sorted(references - {os.path.basename(item.filename) for item in selected + skipped})
+        if missing:
+            print(f"⚠️ Referenced but not in manifest: {', '.join(missing)}")
+        return True
+    
+    def download_assets(self, category: str = None, remote: str = None) -> bool:
+        """Pull tracked assets from the mirror/cloud into the local asset folder"""
+        from asset_transfer import TransferEngine
+        source = self.remote_endpoint(remote)
+        if source is None:
+            print("❌ No download source: pass --remote, or enable asset_storage.local_mirror "
+                  "or cloud_fallback in config/assets.yaml")
+            return False
+        
+        if category and category not in self.manifest['categories']:
+            print(f"❌ Category '{category}' not found in manifest")
+            return False
+        
+        dest_root = self._local_asset_root()
+        jobs = self._transfer_jobs(category)
+        print(f"⬇️  Downloading {len(jobs)} files from {source} to {dest_root}")
+        engine = TransferEngine(self.jobs, checksum_func=self.cached_checksum)
+        results = engine.fetch(source, dest_root, jobs)
+        self.stat_cache.save()
+        self._print_transfer_summary(results)
+        return all(result.status != 'failed' for result in results)
+    
+    def upload_assets(self, path: str = None, category: str = None, remote: str = None) -> bool:
+        """Push local assets (a path inside the asset folder, or tracked assets) to the mirror/cloud"""
+        from asset_io import walk_files
+        from asset_transfer import TransferEngine, TransferJob
+        dest = self.remote_endpoint(remote)
+        if dest is None:
+            print("❌ No upload destination: pass --remote, or enable asset_storage.local_mirror "
+                  "or cloud_fallback in config/assets.yaml")
+            return False
+        if not self.dropbox_path:
+            print("❌ Dropbox audio assets folder not found")
+            return False
+        
+        if path:
+            # Accept absolute paths or paths relative to the asset folder
+            full_path = os.path.abspath(os.path.join(self.dropbox_path, os.path.expanduser(path)))
+            rel_root = os.path.relpath(full_path, self.dropbox_path)
+            if rel_root.startswith('..'):
+                print(f"❌ {path} is not inside the asset folder {self.dropbox_path}")
+                return False
+            if os.path.isdir(full_path):
+                rel_paths = [f"{rel_root}/{entry.rel_path}" if rel_root != '.' else entry.rel_path
+                             for entry in walk_files(full_path)]
+            elif os.path.isfile(full_path):
+                rel_paths = [rel_root.replace(os.sep, '/')]
+            else:
+                print(f"❌ File not found: {full_path}")
+                return False
+            jobs = [TransferJob(rel_path, self.cached_checksum(os.path.join(self.dropbox_path, rel_path)))
+                    for rel_path in rel_paths]
+        else:
+            jobs = [job for job in self._transfer_jobs(category)
+                    if os.path.exists(os.path.join(self.dropbox_path, job.rel_path))]
+        
+        print(f"⬆️  Uploading {len(jobs)} files from {self.dropbox_path} to {dest}")
+        engine = TransferEngine(self.jobs, checksum_func=self.cached_checksum)
+        results = engine.push(self.dropbox_path, dest, jobs)
+        self.stat_cache.save()
+        self._print_transfer_summary(results)
+        return all(result.status != 'failed' for result in results)
     
     def register_asset(self, source_path: str, category: str, filename: str = None, metadata: Dict = None):
         """Register an asset by copying it to the Dropbox folder and updating manifest"""
         if not self.verify_dropbox_setup():
             return False
         
+        registered = self._register_one(source_path, category, filename, metadata)
+        self.stat_cache.save()
+        return registered
+    
+    def register_many(self, source_paths: List[str], category: str, metadata: Dict = None) -> int:
+        """Register many assets, writing the manifest once at the end
+        
+        Each entry may be a file or a directory; directories are walked
+        recursively and keep their relative layout inside the category.
+        Returns the number of assets registered.
+        """
+        from asset_io import walk_files
+        if not self.verify_dropbox_setup():
+            return 0
+        
+        jobs = []
+        for source_path in source_paths:
+            if os.path.isdir(source_path):
+                jobs.extend((entry.path, entry.rel_path) for entry in sorted(walk_files(source_path)))
+            else:
+                jobs.append((source_path, None))
+        
+        registered = 0
+        with self.batch():
+            for source_path, filename in jobs:
+                if self._register_one(source_path, category, filename, metadata):
+                    registered += 1
+        
+        self.stat_cache.save()
+        print(f"✅ Registered {registered}/{len(jobs)} assets in category '{category}'")
+        return registered
+    
+    def _register_one(self, source_path: str, category: str, filename: str = None, metadata: Dict = None) -> bool:
+        """Copy one file into the Dropbox folder and record it in the manifest"""
+        from audio_metadata import read_audio_metadata
+        from asset_io import copy_and_hash
         if not os.path.exists(source_path):
             print(f"❌ Source file not found: {source_path}")
             return False
@@ -137,41 +644,84 @@ class AudioAssetManager:
         if not filename:
             filename = os.path.basename(source_path)
         
+        if self.content_addressed:
+            return self._register_blob(source_path, category, filename, metadata)
+        
         # Copy file to Dropbox folder
         dest_path = self.get_asset_path(category, filename)
         os.makedirs(os.path.dirname(dest_path), exist_ok=True)
         
         print(f"📁 Copying {filename} to Dropbox folder...")
-        shutil.copy2(source_path, dest_path)
+        method, checksum = copy_and_hash(source_path, dest_path, allow_hardlink=self.allow_hardlinks)
+        print(f"  ↳ copy method: {method}")
+        if self.verify_copies and method not in ('in-place', 'hardlink'):
+            if not self._verify_copy(dest_path, checksum, filename):
+                return False
         
         # Update manifest
-        if category not in self.manifest['categories']:
-            self.manifest['categories'][category] = {
-                'description': f'{category} assets',
-                'count': 0,
-                'assets': {}
-            }
-        
-        file_size = os.path.getsize(dest_path)
+        st = os.stat(dest_path)
+        file_size = st.st_size
+        self.stat_cache.put(dest_path, st, checksum)
         asset_info = {
             'dropbox_path': f"{category}/{filename}",
             'size_bytes': file_size,
             'size_human': self.human_readable_size(file_size),
-            'checksum': self.calculate_checksum(dest_path),
+            'checksum': checksum,
             'created': datetime.now().isoformat(),
-            'metadata': metadata or {}
+            'metadata': {**read_audio_metadata(dest_path), **(metadata or {})}
         }
         
-        self.manifest['categories'][category]['assets'][filename] = asset_info
-        self.manifest['categories'][category]['count'] = len(self.manifest['categories'][category]['assets'])
-        self.save_manifest()
+        self.add_assets(category, {filename: asset_info})
         
         print(f"✅ Registered asset: {filename} in category '{category}'")
         print(f"📍 Location: {dest_path}")
         return True
     
+    def _verify_copy(self, dest_path: str, checksum: str, filename: str) -> bool:
+        """Re-read a copied file and compare it with the source checksum"""
+        if self.calculate_checksum(dest_path) == checksum:
+            print(f"  ↳ verified {checksum[:12]}")
+            return True
+        
+        print(f"❌ Verification failed for {filename}: copy does not match source, removing it")
+        os.unlink(dest_path)
+        return False
+    
+    def _register_blob(self, source_path: str, category: str, filename: str, metadata: Dict = None) -> bool:
+        """Store a file by content and point a manifest entry at the blob"""
+        from audio_metadata import read_audio_metadata
+        # A checksum the stat cache already has lets a known blob skip all I/O;
+        # otherwise the file is hashed first and only copied if the blob is new
+        st = os.stat(source_path)
+        blob_path, checksum, method = self.blobs.put(source_path, self.stat_cache.get(source_path, st))
+        self.stat_cache.put(source_path, st, checksum)
+        if method:
+            print(f"📁 Stored {filename} as blob {checksum[:12]} (via {method})")
+            if self.verify_copies and not self._verify_copy(blob_path, checksum, filename):
+                return False
+        else:
+            print(f"♻️ {filename} already stored as blob {checksum[:12]}, skipping copy")
+        
+        file_size = os.path.getsize(blob_path)
+        asset_info = {
+            'dropbox_path': self.blobs.relative_path(checksum),
+            'blob': checksum,
+            'size_bytes': file_size,
+            'size_human': self.human_readable_size(file_size),
+            'checksum': checksum,
+            'created': datetime.now().isoformat(),
+            'metadata': {**read_audio_metadata(blob_path), **(metadata or {})}
+        }
+        
+        self.add_assets(category, {filename: asset_info})
+        
+        print(f"✅ Registered asset: {filename} in category '{category}'")
+        print(f"📍 Location: {blob_path}")
+        return True
+    
     def list_assets(self, category: str = None):
         """List assets in repository"""
+        from asset_io import list_subdirs, walk_files
         if not self.verify_dropbox_setup():
             return
         
@@ -184,7 +734,7 @@ class AudioAssetManager:
                 category_path = os.path.join(self.dropbox_path, category)
                 if os.path.exists(category_path):
                     print(f"💡 Found untracked files in Dropbox folder: {category_path}")
-                    files = [f for f in os.listdir(category_path) if os.path.isfile(os.path.join(category_path, f))]
+                    files = sorted(entry.rel_path for entry in walk_files(category_path))
                     if files:
                         print("Untracked files:")
                         for file in files:
@@ -199,8 +749,7 @@ class AudioAssetManager:
             
             # Check for untracked categories
             if os.path.exists(self.dropbox_path):
-                existing_folders = [d for d in os.listdir(self.dropbox_path) 
-                                 if os.path.isdir(os.path.join(self.dropbox_path, d))]
+                existing_folders = list_subdirs(self.dropbox_path)
                 untracked = [f for f in existing_folders if f not in self.manifest['categories']]
                 if untracked:
                     print(f"\n💡 Untracked folders found: {', '.join(untracked)}")
@@ -208,6 +757,7 @@ class AudioAssetManager:
     
     def _list_category_assets(self, category: str):
         """List assets in a specific category"""
+        from asset_io import walk_files
         cat_data = self.manifest['categories'][category]
         print(f"\n📂 Category: {category}")
         print(f"Description: {cat_data.get('description', 'No description')}")
@@ -215,84 +765,189 @@ class AudioAssetManager:
         
         category_path = os.path.join(self.dropbox_path, category)
         if os.path.exists(category_path):
-            actual_files = set(f for f in os.listdir(category_path) 
-                              if os.path.isfile(os.path.join(category_path, f)))
+            actual_files = {entry.rel_path: entry for entry in walk_files(category_path)}
             tracked_files = set(cat_data.get('assets', {}).keys())
             
             print(f"Actual files in Dropbox: {len(actual_files)}")
             
             print("\n📄 Assets:")
             for name, info in cat_data.get('assets', {}).items():
-                file_path = os.path.join(category_path, name)
-                status = "✅ Synced" if os.path.exists(file_path) else "⚠️ Missing locally"
+                if info.get('blob'):
+                    synced = self.blobs.contains(info['blob'])
+                else:
+                    synced = name in actual_files
+                status = "✅ Synced" if synced else "⚠️ Missing locally"
                 print(f"  {name} ({info.get('size_human', 'Unknown size')}) - {status}")
             
             # Show untracked files
-            untracked = actual_files - tracked_files
+            untracked = actual_files.keys() - tracked_files
             if untracked:
                 print(f"\n💡 Untracked files ({len(untracked)}):")
                 for file in sorted(untracked):
-                    file_path = os.path.join(category_path, file)
-                    size = self.human_readable_size(os.path.getsize(file_path))
+                    size = self.human_readable_size(actual_files[file].stat.st_size)
                     print(f"  📄 {file} ({size}) - Not in manifest")
     
     def scan_assets(self, category: str = None):
         """Scan Dropbox folder and add untracked assets to manifest"""
+        from asset_io import list_subdirs
         if not self.verify_dropbox_setup():
             return
         
         categories_to_scan = [category] if category else []
         if not categories_to_scan:
             # Scan all existing folders
-            categories_to_scan = [d for d in os.listdir(self.dropbox_path) 
-                                if os.path.isdir(os.path.join(self.dropbox_path, d))]
+            categories_to_scan = list_subdirs(self.dropbox_path)
         
-        for cat in categories_to_scan:
-            category_path = os.path.join(self.dropbox_path, cat)
-            if not os.path.exists(category_path):
+        # Write the manifest once for the whole scan
+        with self.batch():
+            for cat in categories_to_scan:
+                self._scan_category(cat)
+        
+        self.stat_cache.save()
+    
+    def _scan_category(self, cat: str):
+        """Add untracked files in one category folder to the manifest"""
+        from audio_metadata import is_audio_file, read_audio_metadata_many
+        from asset_io import walk_files
+        category_path = os.path.join(self.dropbox_path, cat)
+        if not os.path.exists(category_path):
+            return
+        
+        print(f"🔍 Scanning category: {cat}")
+        
+        cat_data = self.manifest['categories'].get(cat) or {}
+        tracked_files = set(cat_data.get('assets', {}).keys())
+        actual_files = {entry.rel_path: entry for entry in walk_files(category_path)}
+        
+        untracked = sorted(actual_files.keys() - tracked_files)
+        checksums = self.hasher.checksum_many(actual_files[f].path for f in untracked)
+        # Headers only, so this is cheap next to hashing; also backfills older entries.
+        # Non-audio files never get a 'format', so they are left out rather than reread every scan
+        needs_metadata = [f for f in tracked_files & actual_files.keys()
+                          if is_audio_file(f)
+                          and 'format' not in (cat_data['assets'][f].get('metadata') or {})
+                          and not cat_data['assets'][f].get('blob')]
+        audio_info = read_audio_metadata_many(
+            (actual_files[f].path for f in untracked + sorted(needs_metadata)), self.jobs)
+        added = {}
+        
+        for filename in sorted(needs_metadata):
+            info = audio_info[actual_files[filename].path]
+            if info:
+                asset = cat_data['assets'][filename]
+                added[filename] = dict(asset, metadata={**(asset.get('metadata') or {}), **info})
+        
+        for filename in untracked:
+            entry = actual_files[filename]
+            if checksums.get(entry.path) is None:
+                print(f"  ⚠️ Could not read {filename}, skipping")
                 continue
-                
-            print(f"🔍 Scanning category: {cat}")
-            
-            # Initialize category in manifest if needed
-            if cat not in self.manifest['categories']:
-                self.manifest['categories'][cat] = {
-                    'description': f'{cat} assets',
-                    'count': 0,
-                    'assets': {}
-                }
-            
-            tracked_files = set(self.manifest['categories'][cat].get('assets', {}).keys())
-            actual_files = set(f for f in os.listdir(category_path) 
-                             if os.path.isfile(os.path.join(category_path, f)))
+            file_size = entry.stat.st_size
+            self.stat_cache.put(entry.path, entry.stat, checksums[entry.path])
             
-            untracked = actual_files - tracked_files
-            
-            for filename in untracked:
-                file_path = os.path.join(category_path, filename)
-                file_size = os.path.getsize(file_path)
-                
-                asset_info = {
-                    'dropbox_path': f"{cat}/{filename}",
-                    'size_bytes': file_size,
-                    'size_human': self.human_readable_size(file_size),
-                    'checksum': self.calculate_checksum(file_path),
-                    'created': datetime.now().isoformat(),
-                    'metadata': {'scanned': True}
-                }
-                
-                self.manifest['categories'][cat]['assets'][filename] = asset_info
-                print(f"  ✅ Added to manifest: {filename}")
-            
-            # Update count
-            self.manifest['categories'][cat]['count'] = len(self.manifest['categories'][cat]['assets'])
+            asset_info = {
+                'dropbox_path': f"{cat}/{filename}",
+                'size_bytes': file_size,
+                'size_human': self.human_readable_size(file_size),
+                'checksum': checksums[entry.path],
+                'created': datetime.now().isoformat(),
+                'metadata': {'scanned': True, **audio_info[entry.path]}
+            }
             
-            if untracked:
-                print(f"✅ Added {len(untracked)} assets to manifest for category '{cat}'")
+            added[filename] = asset_info
+            print(f"  ✅ Added to manifest: {filename}")
+        
+        # Initializes the category in the manifest if needed
+        self.add_assets(cat, added)
+        
+        described = len(added) - sum(1 for f in added if f in tracked_files)
+        if untracked:
+            print(f"✅ Added {described} assets to manifest for category '{cat}'")
+        if len(added) > described:
+            print(f"🎚  Filled in audio metadata for {len(added) - described} tracked assets")
+        if not untracked:
+            print(f"✅ All assets in '{cat}' already tracked")
+    
+    def watch_assets(self, quiet: float = 2.0, force_polling: bool = False, poll_interval: float = 5.0):
+        """Follow the Dropbox folder and record new or modified files as they settle"""
+        from asset_io import walk_files
+        from asset_watch import RESCAN, InotifyWatcher, debounce, open_watcher
+        if not self.verify_dropbox_setup():
+            return
+        
+        watcher = open_watcher(self.dropbox_path, force_polling, poll_interval)
+        mode = 'inotify' if isinstance(watcher, InotifyWatcher) else f'polling every {poll_interval}s'
+        print(f"👀 Watching {self.dropbox_path} ({mode}); press Ctrl+C to stop")
+        try:
+            for changed in debounce(watcher, quiet):
+                if changed is RESCAN:
+                    print("⚠️ File events were dropped; rechecking every file")
+                    changed = {entry.path for entry in walk_files(self.dropbox_path)}
+                self._record_changes(changed)
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+        finally:
+            watcher.close()
+            self.stat_cache.save()
+    
+    def _record_changes(self, paths):
+        """Hash changed files (skipping unchanged ones via the stat cache) and update their entries"""
+        from audio_metadata import read_audio_metadata_many
+        candidates = {}
+        for path in sorted(paths):
+            rel_path = os.path.relpath(path, self.dropbox_path).replace(os.sep, '/')
+            # Files directly in the root belong to no category; skip in-flight transfers
+            if '/' not in rel_path or rel_path.endswith(('.part', '.tmp')):
+                continue
+            category, filename = rel_path.split('/', 1)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                if self.find_asset(category, filename):
+                    print(f"  ⚠️ Missing locally: {rel_path}")
+                continue
+            candidates[path] = (category, filename, st)
+        
+        checksums = {path: self.stat_cache.get(path, st) for path, (_, _, st) in candidates.items()}
+        to_hash = [path for path, checksum in checksums.items() if checksum is None]
+        for path, checksum in self.hasher.iter_checksums(to_hash):
+            checksums[path] = checksum
+            if checksum is not None:
+                self.stat_cache.put(path, candidates[path][2], checksum)
+        
+        changed = {}
+        for path, (category, filename, st) in candidates.items():
+            checksum = checksums[path]
+            asset = self.find_asset(category, filename)
+            if checksum is None or (asset and asset.get('checksum') == checksum and not asset.get('blob')):
+                continue
+            changed[path] = asset
+        audio_info = read_audio_metadata_many(changed, self.jobs)
+        
+        updates = {}
+        for path, asset in changed.items():
+            category, filename, st = candidates[path]
+            if asset:
+                asset_info = dict(asset, modified=datetime.now().isoformat())
+                asset_info.pop('blob', None)
+                print(f"  🔄 Updated: {category}/{filename}")
             else:
-                print(f"✅ All assets in '{cat}' already tracked")
+                asset_info = {'created': datetime.now().isoformat(), 'metadata': {'scanned': True}}
+                print(f"  ✅ Added to manifest: {category}/{filename}")
+            asset_info.update({
+                'dropbox_path': f"{category}/{filename}",
+                'size_bytes': st.st_size,
+                'size_human': self.human_readable_size(st.st_size),
+                'checksum': checksums[path],
+                'metadata': {**(asset_info.get('metadata') or {}), **audio_info[path]},
+            })
+            updates.setdefault(category, {})[filename] = asset_info
         
-        self.save_manifest()
+        if updates:
+            with self.batch():
+                for category, assets in updates.items():
+                    self.add_assets(category, assets)
+        self.stat_cache.save()
     
     @staticmethod
     def human_readable_size(size_bytes: int) -> str:
@@ -303,37 +958,64 @@ class AudioAssetManager:
             size_bytes /= 1024.0
         return f"{size_bytes:.1f}TB"
     
-    def validate_assets(self):
-        """Validate assets in Dropbox folder against manifest"""
+    def validate_assets(self, full: bool = False):
+        """Validate assets in Dropbox folder against manifest
+        
+        Unchanged files (same size, mtime and inode as when last hashed) reuse
+        their cached checksum unless ``full`` forces a complete re-hash.
+        """
         if not self.verify_dropbox_setup():
             return
         
         print("🔍 Validating assets...")
         issues = []
         missing_files = []
+        to_hash = {}
+        stats = {}
+        cached = 0
         
         for category, cat_data in self.manifest['categories'].items():
-            category_path = os.path.join(self.dropbox_path, category)
-            
             for filename, asset in cat_data.get('assets', {}).items():
-                file_path = os.path.join(category_path, filename)
+                file_path = self.resolve_asset_path(category, filename, asset)
                 
-                if not os.path.exists(file_path):
+                try:
+                    st = os.stat(file_path)
+                except FileNotFoundError:
                     missing_files.append(f"{category}/{filename}")
                     continue
                 
                 # Check file size
-                actual_size = os.path.getsize(file_path)
+                actual_size = st.st_size
                 expected_size = asset.get('size_bytes', 0)
                 
                 if actual_size != expected_size:
                     issues.append(f"Size mismatch: {category}/{filename} (expected {expected_size}, got {actual_size})")
                 
-                # Check checksum if available
+                # Check checksum if available, reusing the stat cache when possible
                 if asset.get('checksum'):
-                    actual_checksum = self.calculate_checksum(file_path)
-                    if actual_checksum != asset['checksum']:
-                        issues.append(f"Checksum mismatch: {category}/{filename}")
+                    rel_path = f"{category}/{filename}"
+                    actual_checksum = None if full else self.stat_cache.get(file_path, st)
+                    if actual_checksum is not None:
+                        cached += 1
+                        if actual_checksum != asset['checksum']:
+                            issues.append(f"Checksum mismatch: {rel_path}")
+                    else:
+                        # Deduplicated entries share a blob, which is hashed once
+                        to_hash.setdefault(file_path, []).append((rel_path, asset['checksum']))
+                        stats[file_path] = st
+        
+        # Hash new or modified files concurrently
+        if to_hash:
+            print(f"🔐 Hashing {len(to_hash)} files ({cached} unchanged, skipped)")
+        for file_path, actual_checksum in self.hasher.iter_checksums(to_hash):
+            if actual_checksum is not None:
+                self.stat_cache.put(file_path, stats[file_path], actual_checksum)
+            for rel_path, expected_checksum in to_hash[file_path]:
+                if actual_checksum is None:
+                    missing_files.append(rel_path)
+                elif actual_checksum != expected_checksum:
+                    issues.append(f"Checksum mismatch: {rel_path}")
+        self.stat_cache.save()
         
         # Report results
         if missing_files:
@@ -349,18 +1031,124 @@ class AudioAssetManager:
         
         if not missing_files and not issues:
             print("✅ All assets validated successfully")
+    
+    def find_duplicates(self, threshold: float = 0.2) -> List[List[str]]:
+        """Report identical and acoustically near-identical recordings across categories
+        
+        Fingerprints are cached in .cache/fingerprints.npz by checksum, so
+        only new recordings are decoded. Returns groups of "category/filename".
+        """
+        from audio_metadata import is_audio_file
+        try:
+            from asset_fingerprint import FingerprintIndex, group_pairs
+        except ImportError as e:
+            print(f"❌ Duplicate detection needs NumPy: {e}")
+            return []
+        
+        entries: Dict[str, List[str]] = {}
+        sizes: Dict[str, int] = {}
+        paths: Dict[str, str] = {}
+        for category, cat_data in self.manifest['categories'].items():
+            for filename, asset in (cat_data.get('assets') or {}).items():
+                checksum = asset.get('checksum')
+                if not checksum or not is_audio_file(filename):
+                    continue
+                entries.setdefault(checksum, []).append(f"{category}/{filename}")
+                sizes[checksum] = asset.get('size_bytes', 0) or 0
+                if checksum not in paths:
+                    path = self.source_asset_path(category, filename, asset)
+                    if path:
+                        paths[checksum] = path
+        
+        index = FingerprintIndex()
+        todo = len(paths.keys() - set(index.checksums))
+        if todo:
+            print(f"🎼 Fingerprinting {todo} recordings ({len(index.checksums)} already indexed)")
+        
+        def progress(checksum, error):
+            if error:
+                print(f"  ⚠️ {entries[checksum][0]}: {error}")
+        
+        index.update(paths, keep=set(entries), jobs=self.jobs, progress=progress)
+        index.save()
+        
+        groups = []
+        reclaimable = 0
+        identical = [names for names in entries.values() if len(names) > 1]
+        if identical:
+            print(f"\n♻️ Identical copies (same checksum): {len(identical)} groups")
+            for names in identical:
+                print(f"  {', '.join(names)}")
+            groups.extend(identical)
+        
+        near = group_pairs(index.near_duplicates(threshold))
+        if near:
+            print(f"\n🎧 Near-duplicate recordings: {len(near)} groups")
+            for checksums in near:
+                checksums.sort(key=lambda checksum: -sizes[checksum])
+                names = [name for checksum in checksums for name in entries[checksum]]
+                for checksum in checksums:
+                    for name in entries[checksum]:
+                        print(f"  {name} ({self.human_readable_size(sizes[checksum])})")
+                print()
+                # Keep the largest (usually highest-resolution) export
+                reclaimable += sum(sizes[checksum] for checksum in checksums[1:])
+                groups.append(names)
+        
+        if not groups:
+            print("✅ No duplicate recordings found")
+        elif reclaimable:
+            print(f"💾 Removing all but the largest file of each near-duplicate group would free "
+                  f"{self.human_readable_size(reclaimable)}")
+        return groups
+
+def _parse_size(text: str) -> int:
+    """argparse type for sizes like 10MB; imports asset_io only when the option is given"""
+    from asset_io import parse_size
+    return parse_size(text)
 
 def main():
     parser = argparse.ArgumentParser(description="Audio Asset Manager for Dropbox-synced assets")
-    parser.add_argument('action', choices=['verify', 'list', 'register', 'scan', 'validate'])
+    parser.add_argument('action', choices=['verify', 'list', 'register', 'scan', 'validate',
+                                           'export-manifest', 'import-manifest', 'cache',
+                                           'download', 'upload', 'subset', 'watch', 'query', 'dupes',
+                                           'decode'])
+    parser.add_argument('path', nargs='?', help='Path inside the asset folder to upload')
     parser.add_argument('--category', help='Asset category')
-    parser.add_argument('--file', help='File path to register')
+    parser.add_argument('--file', help='File or directory to register')
+    parser.add_argument('--files-from', help='Text file listing paths to register, one per line')
     parser.add_argument('--filename', help='Custom filename for registered asset')
     parser.add_argument('--all', action='store_true', help='Apply to all categories')
+    parser.add_argument('--jobs', '-j', type=int, help='Number of files to hash in parallel (default: CPU count, max 8)')
+    parser.add_argument('--full', action='store_true', help='Re-hash every asset, ignoring the local stat cache')
+    parser.add_argument('--verify', action='store_true', help='Re-read registered copies and compare checksums')
+    parser.add_argument('--force', action='store_true',
+                        help='export-manifest: overwrite the YAML even if it changed since the last sync')
+    parser.add_argument('--clear', action='store_true', help='Empty the local asset cache (or decoded cache)')
+    parser.add_argument('--remote', help='Mirror directory or http(s) URL for download/upload/subset')
+    parser.add_argument('--dest', help='Destination folder for subset (default: development.dev_subset_location)')
+    parser.add_argument('--debounce', type=float, default=2.0, help='Seconds of quiet before watch records a burst of changes')
+    parser.add_argument('--poll', type=float, help='Make watch poll every N seconds instead of using inotify')
+    parser.add_argument('--sample-rate', type=int, help='query: sample rate in Hz')
+    parser.add_argument('--vehicle-type', help='query: metadata vehicle_type')
+    parser.add_argument('--location', help='query: metadata location')
+    parser.add_argument('--min-duration', type=float, help='query: minimum duration in seconds')
+    parser.add_argument('--max-duration', type=float, help='query: maximum duration in seconds')
+    parser.add_argument('--min-size', type=_parse_size, help='query: minimum file size, e.g. 10MB')
+    parser.add_argument('--max-size', type=_parse_size, help='query: maximum file size, e.g. 1GB')
+    parser.add_argument('--recorded-after', help='query: earliest recording_date (YYYY-MM-DD)')
+    parser.add_argument('--recorded-before', help='query: latest recording_date (YYYY-MM-DD)')
+    parser.add_argument('--checksum', help='query: SHA256 checksum or prefix')
+    parser.add_argument('--where', action='append', default=[], metavar='FIELD=VALUE',
+                        help='query: match any other metadata field (repeatable)')
+    # asset_query.OUTPUT_FORMATS, spelled out so that --help does not import the query module
+    parser.add_argument('--format', choices=('table', 'json', 'csv'), default='table', help='query: output format')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='dupes: fraction of matching fingerprint hashes that counts as a duplicate')
     
     args = parser.parse_args()
     
-    manager = AudioAssetManager()
+    manager = AudioAssetManager(jobs=args.jobs, verify=args.verify)
     
     if args.action == 'verify':
         manager.verify_dropbox_setup()
@@ -369,13 +1157,22 @@ def main():
         manager.list_assets(args.category)
     
     elif args.action == 'register':
-        if not args.file:
-            print("❌ Please specify --file to register")
+        if not args.file and not args.files_from:
+            print("❌ Please specify --file or --files-from to register")
             return
         if not args.category:
             print("❌ Please specify --category")
             return
-        manager.register_asset(args.file, args.category, args.filename)
+        if args.files_from:
+            with open(args.files_from, 'r') as f:
+                sources = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+            if args.file:
+                sources.insert(0, args.file)
+            manager.register_many(sources, args.category)
+        elif os.path.isdir(args.file):
+            manager.register_many([args.file], args.category)
+        else:
+            manager.register_asset(args.file, args.category, args.filename)
     
     elif args.action == 'scan':
         if args.all:
@@ -386,7 +1183,69 @@ def main():
             print("❌ Please specify --category or --all")
     
     elif args.action == 'validate':
-        manager.validate_assets()
+        manager.validate_assets(full=args.full)
+    
+    elif args.action == 'export-manifest':
+        manager.export_manifest(force=args.force)
+    
+    elif args.action == 'import-manifest':
+        manager.import_manifest()
+    
+    elif args.action == 'cache':
+        if args.clear:
+            if manager.cache:
+                freed = manager.cache.clear()
+                print(f"🧹 Cleared {manager.human_readable_size(freed)} from the local cache")
+            else:
+                manager.cache_status()
+        elif args.all or args.category:
+            manager.cache_assets(args.category)
+        else:
+            manager.cache_status()
+    
+    elif args.action == 'download':
+        if args.all or args.category:
+            manager.download_assets(args.category, args.remote)
+        else:
+            print("❌ Please specify --category or --all")
+    
+    elif args.action == 'upload':
+        if args.path or args.all or args.category:
+            manager.upload_assets(args.path, args.category, args.remote)
+        else:
+            print("❌ Please specify a path, --category or --all")
+    
+    elif args.action == 'subset':
+        manager.materialize_subset(args.dest, args.remote)
+    
+    elif args.action == 'watch':
+        manager.watch_assets(args.debounce, force_polling=args.poll is not None, poll_interval=args.poll or 5.0)
+    
+    elif args.action == 'query':
+        where = dict(condition.split('=', 1) for condition in args.where if '=' in condition)
+        records = manager.query(category=args.category, sample_rate=args.sample_rate,
+                                vehicle_type=args.vehicle_type, location=args.location,
+                                min_duration=args.min_duration, max_duration=args.max_duration,
+                                min_size=args.min_size, max_size=args.max_size,
+                                recorded_after=args.recorded_after, recorded_before=args.recorded_before,
+                                checksum=args.checksum, where=where)
+        if args.format == 'table':
+            print(f"🔎 {len(records)} matching assets")
+        if records or args.format != 'table':
+            from asset_query import format_records
+            print(format_records(records, args.format))
+    
+    elif args.action == 'dupes':
+        manager.find_duplicates(args.threshold)
+    
+    elif args.action == 'decode':
+        if args.clear:
+            freed = manager.decoded_cache.clear()
+            print(f"🧹 Cleared {manager.human_readable_size(freed)} of decoded audio")
+        elif args.all or args.category:
+            manager.decode_assets(args.category)
+        else:
+            print("❌ Please specify --category or --all")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+In-memory query index over the asset manifest
+
+AssetIndex flattens the manifest into records once and builds lookup
+tables lazily, one per field the first time a query uses it: hash maps for
+exact matches (sample_rate, vehicle_type, location, ...) and sorted
+arrays for ranges and prefixes (duration, size_bytes, recording_date,
+checksum). A query intersects the candidate sets from each filter, so
+repeated queries in the same process never rescan the manifest.
+"""
+
+import csv
+import io
+import json
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Entry fields that live at the top level of an asset rather than under 'metadata'
+ASSET_FIELDS = ('dropbox_path', 'size_bytes', 'checksum', 'created', 'modified', 'blob')
+OUTPUT_FORMATS = ('table', 'json', 'csv')
+
+
+class AssetRecord(NamedTuple):
+    category: str
+    filename: str
+    asset: Dict
+
+    @property
+    def metadata(self) -> Dict:
+        return self.asset.get('metadata') or {}
+
+    def get(self, field: str):
+        """Value of a top-level or metadata field, or None"""
+        if field == 'category':
+            return self.category
+        if field == 'filename':
+            return self.filename
+        if field in ASSET_FIELDS:
+            return self.asset.get(field)
+        return self.metadata.get(field)
+
+
+def _key(value) -> str:
+    """Normalise exact-match values so 48000, '48000' and 'EV'/'ev' compare equal"""
+    return str(value).strip().lower()
+
+
+class AssetQuery(NamedTuple):
+    """Filters for AssetIndex.search; every given filter must match"""
+    category: Optional[str] = None
+    sample_rate: Optional[int] = None
+    vehicle_type: Optional[str] = None
+    location: Optional[str] = None
+    min_duration: Optional[float] = None
+    max_duration: Optional[float] = None
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+    recorded_after: Optional[str] = None
+    recorded_before: Optional[str] = None
+    checksum: Optional[str] = None           # full checksum or prefix
+    where: Optional[Dict[str, str]] = None   # any other field=value pairs
+
+
+class AssetIndex:
+    """Query index built from a manifest dictionary"""
+
+    def __init__(self, manifest: Dict):
+        self.records: List[AssetRecord] = [
+            AssetRecord(category, filename, asset)
+            for category, cat_data in (manifest.get('categories') or {}).items()
+            for filename, asset in (cat_data.get('assets') or {}).items()
+        ]
+        self._exact: Dict[str, Dict[str, List[int]]] = {}
+        self._sorted: Dict[str, Tuple[list, List[int]]] = {}
+
+    def __len__(self):
+        return len(self.records)
+
+    def _exact_index(self, field: str) -> Dict[str, List[int]]:
+        if field not in self._exact:
+            table: Dict[str, List[int]] = {}
+            for i, record in enumerate(self.records):
+                value = record.get(field)
+                if value is not None:
+                    table.setdefault(_key(value), []).append(i)
+            self._exact[field] = table
+        return self._exact[field]
+
+    def _sorted_index(self, field: str, convert) -> Tuple[list, List[int]]:
+        if field not in self._sorted:
+            pairs = []
+            for i, record in enumerate(self.records):
+                try:
+                    value = record.get(field)
+                    if value is not None:
+                        pairs.append((convert(value), i))
+                except (TypeError, ValueError):
+                    continue
+            pairs.sort()
+            self._sorted[field] = ([value for value, _ in pairs], [i for _, i in pairs])
+        return self._sorted[field]
+
+    def _equal(self, field: str, value) -> Set[int]:
+        return set(self._exact_index(field).get(_key(value), ()))
+
+    def _between(self, field: str, low, high, convert) -> Set[int]:
+        values, ids = self._sorted_index(field, convert)
+        start = bisect_left(values, convert(low)) if low is not None else 0
+        end = bisect_right(values, convert(high)) if high is not None else len(values)
+        return set(ids[start:end])
+
+    def _prefix(self, field: str, prefix: str) -> Set[int]:
+        values, ids = self._sorted_index(field, _key)
+        prefix = _key(prefix)
+        start = bisect_left(values, prefix)
+        end = bisect_left(values, prefix + '\uffff')
+        return set(ids[start:end])
+
+    def search(self, query: AssetQuery = AssetQuery()) -> List[AssetRecord]:
+        """Return records matching every filter in ``query``, in manifest order"""
+        candidates: List[Set[int]] = []
+        for field in ('category', 'sample_rate', 'vehicle_type', 'location'):
+            value = getattr(query, field)
+            if value is not None:
+                candidates.append(self._equal(field, value))
+        for field, value in (query.where or {}).items():
+            candidates.append(self._equal(field, value))
+        if query.min_duration is not None or query.max_duration is not None:
+            candidates.append(self._between('duration', query.min_duration, query.max_duration, float))
+        if query.min_size is not None or query.max_size is not None:
+            candidates.append(self._between('size_bytes', query.min_size, query.max_size, int))
+        if query.recorded_after is not None or query.recorded_before is not None:
+            # ISO dates (YAML may hand back date objects) sort correctly as strings
+            candidates.append(self._between('recording_date', query.recorded_after, query.recorded_before, str))
+        if query.checksum:
+            candidates.append(self._prefix('checksum', query.checksum))
+
+        if not candidates:
+            return list(self.records)
+        matches = set.intersection(*sorted(candidates, key=len))
+        return [self.records[i] for i in sorted(matches)]
+
+
+def _columns(records: Iterable[AssetRecord]) -> List[str]:
+    metadata_fields = sorted({field for record in records for field in record.metadata})
+    return ['category', 'filename', 'dropbox_path', 'size_bytes', 'checksum'] + metadata_fields
+
+
+def _row(record: AssetRecord, columns: List[str]) -> Dict:
+    return {column: record.get(column) for column in columns}
+
+
+def format_records(records: List[AssetRecord], output: str = 'table') -> str:
+    """Render query results as a table, JSON array or CSV"""
+    if output == 'json':
+        columns = _columns(records)
+        return json.dumps([_row(record, columns) for record in records], indent=2, default=str)
+    if output == 'csv':
+        columns = _columns(records)
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, columns, lineterminator='\n')
+        writer.writeheader()
+        for record in records:
+            writer.writerow(_row(record, columns))
+        return buffer.getvalue().rstrip('\n')
+
+    lines = []
+    for record in records:
+        metadata = record.metadata
+        details = ', '.join(f"{field}={metadata[field]}" for field in ('sample_rate', 'duration', 'channels')
+                            if field in metadata)
+        size = record.asset.get('size_human', 'Unknown size')
+        lines.append(f"  {record.category}/{record.filename} ({size}){' - ' + details if details else ''}")
+    return '\n'.join(lines)
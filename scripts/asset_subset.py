@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Development subset planning
+
+Picks which tracked assets a new developer needs first, within the
+development.dev_subset_size budget: files referenced by the sample
+mappings and instrument definitions come first, then the rest of the
+development.dev_categories, smallest first so the budget covers as many
+files as possible.
+"""
+
+import glob
+import os
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from manifest_store import yaml_load
+
+REFERENCE_GLOBS = [
+    'assets/sample_mappings/*.yaml',
+    'assets/instrument_definitions/*.yaml',
+]
+ASSET_EXTENSIONS = ('.wav', '.flac', '.aif', '.aiff', '.mp3', '.ogg', '.json', '.xml')
+
+
+class SubsetItem(NamedTuple):
+    category: str
+    filename: str
+    asset: Dict
+    referenced: bool
+
+
+def _collect_strings(node, found: Set[str]):
+    if isinstance(node, dict):
+        for value in node.values():
+            _collect_strings(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            _collect_strings(value, found)
+    elif isinstance(node, str) and node.lower().endswith(ASSET_EXTENSIONS):
+        found.add(node)
+
+
+def collect_references(patterns: Iterable[str] = REFERENCE_GLOBS) -> Set[str]:
+    """Return every asset filename mentioned in the mapping/definition YAML files"""
+    found: Set[str] = set()
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, 'r') as f:
+                _collect_strings(yaml_load(f), found)
+    return found
+
+
+def plan_subset(manifest: Dict, references: Set[str], categories: List[str],
+                budget: int) -> Tuple[List[SubsetItem], List[SubsetItem]]:
+    """Choose assets that fit in ``budget`` bytes; return (selected, skipped)
+
+    Referenced assets may come from any category; other candidates only
+    from ``categories``. Content shared by several entries (same checksum)
+    is only counted once against the budget.
+    """
+    referenced, others = [], []
+    for category, cat_data in manifest.get('categories', {}).items():
+        for filename, asset in (cat_data.get('assets') or {}).items():
+            is_referenced = filename in references or os.path.basename(filename) in references
+            if is_referenced:
+                referenced.append(SubsetItem(category, filename, asset, True))
+            elif category in categories:
+                others.append(SubsetItem(category, filename, asset, False))
+
+    def size_of(item: SubsetItem) -> int:
+        return item.asset.get('size_bytes', 0) or 0
+
+    candidates = sorted(referenced, key=size_of) + sorted(others, key=size_of)
+
+    selected, skipped = [], []
+    used = 0
+    seen_content = set()
+    for item in candidates:
+        key = item.asset.get('checksum') or f"{item.category}/{item.filename}"
+        cost = 0 if key in seen_content else size_of(item)
+        if used + cost <= budget:
+            selected.append(item)
+            seen_content.add(key)
+            used += cost
+        else:
+            skipped.append(item)
+    return selected, skipped
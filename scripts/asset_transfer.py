@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Parallel asset transfer engine for download/upload
+
+Endpoints share the Dropbox folder layout (paths such as
+``samples/engine_idle_ev_001.wav``) and come in two kinds:
+
+- LocalEndpoint: a directory, e.g. asset_storage.local_mirror or a USB drive
+- HttpEndpoint: a plain HTTP(S) server, standing in for
+  asset_storage.cloud_fallback.base_url
+
+Transfers run on a bounded thread pool. Each file is written to
+``<dest>.part`` first, so an interrupted transfer resumes from where it
+stopped (HTTP via Range requests). A transfer that ends short of the
+manifest size keeps its ``.part`` file and fails as incomplete, so the
+next run resumes it. It is renamed into place only after its SHA256
+checksum matches the manifest.
+"""
+
+import os
+import hashlib
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from asset_io import DEFAULT_CHUNK_SIZE, hash_file
+
+DEFAULT_TRANSFER_JOBS = 4
+
+
+class TransferJob(NamedTuple):
+    """One file to transfer, addressed by its path relative to the asset root"""
+    rel_path: str
+    checksum: Optional[str] = None
+    size: Optional[int] = None
+
+
+class TransferResult(NamedTuple):
+    rel_path: str
+    status: str              # 'transferred', 'resumed', 'current' or 'failed'
+    bytes: int = 0
+    error: Optional[str] = None
+
+
+class LocalEndpoint:
+    """A directory laid out like the Dropbox asset folder"""
+
+    def __init__(self, root: str):
+        self.root = os.path.expanduser(root)
+
+    def __str__(self):
+        return self.root
+
+    def path(self, rel_path: str) -> str:
+        return os.path.join(self.root, *rel_path.split('/'))
+
+    def open_read(self, rel_path: str, offset: int = 0) -> Tuple[BinaryIO, int]:
+        """Open a file for reading at ``offset``; returns (stream, actual offset)"""
+        f = open(self.path(rel_path), 'rb')
+        f.seek(offset)
+        return f, offset
+
+
+class HttpEndpoint:
+    """An HTTP(S) server exposing the asset folder layout under base_url"""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.base_url = base_url.rstrip('/') + '/'
+        self.timeout = timeout
+
+    def __str__(self):
+        return self.base_url
+
+    def url(self, rel_path: str) -> str:
+        return self.base_url + urllib.parse.quote(rel_path)
+
+    def open_read(self, rel_path: str, offset: int = 0) -> Tuple[BinaryIO, int]:
+        """Open a file for reading at ``offset``; returns (stream, actual offset)
+
+        Servers that ignore the Range header answer 200 with the whole
+        file, in which case the actual offset is 0.
+        """
+        request = urllib.request.Request(self.url(rel_path))
+        if offset:
+            request.add_header('Range', f'bytes={offset}-')
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and offset:
+                # Range past the end: the partial file is already complete
+                # (or bogus, which checksum verification will catch)
+                return _EmptyStream(), offset
+            raise
+        return response, offset if response.status == 206 else 0
+
+    def upload(self, local_path: str, rel_path: str):
+        """PUT a local file to the server"""
+        with open(local_path, 'rb') as f:
+            request = urllib.request.Request(
+                self.url(rel_path), data=f, method='PUT',
+                headers={'Content-Length': str(os.path.getsize(local_path)),
+                         'Content-Type': 'application/octet-stream'})
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+
+
+class _EmptyStream:
+    def read(self, n: int = -1) -> bytes:
+        return b''
+
+    def close(self):
+        pass
+
+
+def open_endpoint(spec: str):
+    """Create an endpoint from a directory path or an http(s) URL"""
+    if spec.startswith(('http://', 'https://')):
+        return HttpEndpoint(spec)
+    return LocalEndpoint(spec)
+
+
+class TransferEngine:
+    """Copy many files between endpoints with bounded parallelism, resume and verification"""
+
+    def __init__(self, jobs: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 checksum_func: Callable[[str], str] = hash_file):
+        self.jobs = max(1, jobs or DEFAULT_TRANSFER_JOBS)
+        self.chunk_size = chunk_size
+        # Used to check files already in place; callers can plug in a stat cache
+        self.checksum_func = checksum_func
+        self._print_lock = threading.Lock()
+
+    def _report(self, message: str):
+        with self._print_lock:
+            print(message)
+
+    # Pull: any endpoint -> local directory
+
+    def fetch(self, source, dest_root: str, jobs: Iterable[TransferJob]) -> List[TransferResult]:
+        """Copy every job from ``source`` into ``dest_root`` and return per-file results"""
+        jobs = list(jobs)
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            results = list(pool.map(lambda job: self._fetch_one(source, dest_root, job), jobs))
+        return results
+
+    def _fetch_one(self, source, dest_root: str, job: TransferJob) -> TransferResult:
+        dest_path = os.path.join(dest_root, *job.rel_path.split('/'))
+        try:
+            if self._is_current(dest_path, job):
+                return TransferResult(job.rel_path, 'current')
+
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            part_path = dest_path + '.part'
+            result = self._fetch_into(source, part_path, job)
+            self._check_complete(part_path, job)
+            if job.checksum and result[1] != job.checksum and result[0]:
+                # A resumed file may have a corrupt prefix; retry from scratch once.
+                # This re-downloads the whole file, with no limit on the bytes moved.
+                os.unlink(part_path)
+                result = self._fetch_into(source, part_path, job)
+                self._check_complete(part_path, job)
+            resumed, checksum, transferred = result
+            if job.checksum and checksum != job.checksum:
+                # Full length but wrong content: resuming from it cannot help
+                os.unlink(part_path)
+                raise ValueError("checksum mismatch after transfer")
+            os.replace(part_path, dest_path)
+        except (OSError, ValueError) as e:
+            self._report(f"  ❌ {job.rel_path}: {e}")
+            return TransferResult(job.rel_path, 'failed', error=str(e))
+
+        status = 'resumed' if resumed else 'transferred'
+        self._report(f"  {'⏯' if resumed else '📥'} {job.rel_path} ({transferred} bytes)")
+        return TransferResult(job.rel_path, status, transferred)
+
+    def _is_current(self, dest_path: str, job: TransferJob) -> bool:
+        try:
+            size = os.path.getsize(dest_path)
+        except FileNotFoundError:
+            return False
+        if job.size is not None and size != job.size:
+            return False
+        return not job.checksum or self.checksum_func(dest_path) == job.checksum
+
+    @staticmethod
+    def _check_complete(part_path: str, job: TransferJob):
+        """Raise, keeping part_path for the next run to resume, if the transfer ended short"""
+        received = os.path.getsize(part_path)
+        if job.size is not None and received < job.size:
+            raise ValueError(f"incomplete transfer ({received} of {job.size} bytes); "
+                             f"kept the .part file, run again to resume")
+
+    def _fetch_into(self, source, part_path: str, job: TransferJob) -> Tuple[bool, str, int]:
+        """Append the missing tail of a file to part_path; return (resumed, checksum, bytes moved)"""
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if job.size is not None and offset > job.size:
+            offset = 0
+
+        stream, offset = source.open_read(job.rel_path, offset)
+        sha256_hash = hashlib.sha256()
+        transferred = 0
+        try:
+            with open(part_path, 'r+b' if offset else 'wb') as out:
+                # Re-hash the prefix we already have, then continue with the stream
+                while out.tell() < offset:
+                    chunk = out.read(min(self.chunk_size, offset - out.tell()))
+                    if not chunk:
+                        break
+                    sha256_hash.update(chunk)
+                out.seek(offset)
+                out.truncate()
+                while True:
+                    chunk = stream.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    sha256_hash.update(chunk)
+                    out.write(chunk)
+                    transferred += len(chunk)
+        finally:
+            stream.close()
+        return offset > 0, sha256_hash.hexdigest(), transferred
+
+    # Push: local directory -> any endpoint
+
+    def push(self, local_root: str, dest, jobs: Iterable[TransferJob]) -> List[TransferResult]:
+        """Copy every job from ``local_root`` to ``dest`` and return per-file results"""
+        if isinstance(dest, LocalEndpoint):
+            # Same resumable, verified path as downloads, just in reverse
+            return self.fetch(LocalEndpoint(local_root), dest.root, jobs)
+
+        jobs = list(jobs)
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            return list(pool.map(lambda job: self._upload_one(local_root, dest, job), jobs))
+
+    def _upload_one(self, local_root: str, dest: HttpEndpoint, job: TransferJob) -> TransferResult:
+        local_path = os.path.join(local_root, *job.rel_path.split('/'))
+        try:
+            if job.checksum and self.checksum_func(local_path) != job.checksum:
+                raise ValueError("local file does not match the manifest checksum")
+            dest.upload(local_path, job.rel_path)
+        except (OSError, ValueError) as e:
+            self._report(f"  ❌ {job.rel_path}: {e}")
+            return TransferResult(job.rel_path, 'failed', error=str(e))
+        size = os.path.getsize(local_path)
+        self._report(f"  📤 {job.rel_path} ({size} bytes)")
+        return TransferResult(job.rel_path, 'transferred', size)
+
+
+def summarize(results: List[TransferResult]) -> Dict[str, int]:
+    """Count results by status"""
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    return counts
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Filesystem watchers for keeping the asset manifest live
+
+On Linux the Dropbox folder is followed with inotify (through ctypes, so
+no extra dependency); elsewhere, or when inotify is unavailable or out of
+watches, a polling watcher diffs scandir snapshots instead. Both report
+sets of changed file paths, and debounce() merges the bursts of events
+Dropbox produces while syncing into one batch per quiet period.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from asset_io import walk_files
+
+# Returned instead of a path set when events were lost and callers must rescan
+RESCAN = None
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def _is_hidden(path: str) -> bool:
+    return any(part.startswith('.') for part in path.split(os.sep) if part)
+
+
+class InotifyWatcher:
+    """Recursive inotify watch over a directory tree (Linux only)"""
+
+    def __init__(self, root: str):
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        self.root = root
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, str] = {}
+        self._add_tree(root)
+
+    def close(self):
+        os.close(self.fd)
+
+    def _add_watch(self, path: str):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "inotify watch limit reached (fs.inotify.max_user_watches)")
+            if err not in (errno.ENOENT, errno.ENOTDIR):
+                raise OSError(err, f"inotify_add_watch failed for {path}")
+            return
+        self.watches[wd] = path
+
+    def _add_tree(self, path: str) -> Set[str]:
+        """Watch a directory and its subdirectories; return files already inside"""
+        found = set()
+        self._add_watch(path)
+        for dir_path, dir_names, file_names in os.walk(path):
+            dir_names[:] = [d for d in dir_names if not d.startswith('.')]
+            for name in dir_names:
+                self._add_watch(os.path.join(dir_path, name))
+            found.update(os.path.join(dir_path, name) for name in file_names if not name.startswith('.'))
+        return found
+
+    def poll(self, timeout: float) -> Optional[Set[str]]:
+        """Wait up to ``timeout`` seconds; return changed file paths, or RESCAN on overflow"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed: Set[str] = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='surrogateescape')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                return RESCAN
+            directory = self.watches.get(wd)
+            if directory is None or not name or name.startswith('.'):
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # New folder: watch it and pick up files that landed before the watch did
+                    changed.update(self._add_tree(path))
+                continue
+            if mask & IN_CREATE:
+                # Wait for IN_CLOSE_WRITE before treating a new file as complete
+                continue
+            changed.add(path)
+        return changed
+
+
+class PollingWatcher:
+    """Portable watcher that diffs (size, mtime) snapshots of the tree"""
+
+    def __init__(self, root: str, interval: float = 5.0):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self._snapshot()
+        self._next_poll = time.monotonic() + interval
+
+    def close(self):
+        pass
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        return {entry.path: (entry.stat.st_size, entry.stat.st_mtime_ns) for entry in walk_files(self.root)}
+
+    def poll(self, timeout: float) -> Optional[Set[str]]:
+        """Wait up to ``timeout`` seconds; return paths that were added, changed or removed"""
+        wait = self._next_poll - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return set()
+        if wait > 0:
+            time.sleep(wait)
+        self._next_poll = time.monotonic() + self.interval
+
+        current = self._snapshot()
+        previous, self.snapshot = self.snapshot, current
+        changed = {path for path, sig in current.items() if previous.get(path) != sig}
+        changed.update(previous.keys() - current.keys())
+        return changed
+
+
+def open_watcher(root: str, force_polling: bool = False, poll_interval: float = 5.0):
+    """Create an inotify watcher when possible, otherwise a polling one"""
+    if not force_polling:
+        try:
+            return InotifyWatcher(root)
+        except OSError as e:
+            print(f"💡 inotify unavailable ({e.strerror or e}); falling back to polling every {poll_interval}s")
+    return PollingWatcher(root, poll_interval)
+
+
+def debounce(watcher, quiet: float = 2.0, max_delay: float = 30.0) -> Iterator[Optional[Set[str]]]:
+    """Yield batches of changed paths once events have been quiet for ``quiet`` seconds
+
+    A batch is flushed after ``max_delay`` seconds even if events keep
+    arriving, so a long sync still updates the manifest as it goes. Yields
+    RESCAN when the watcher lost events.
+    """
+    pending: Set[str] = set()
+    first_event = last_event = None
+    while True:
+        changes = watcher.poll(quiet if pending else 1.0)
+        now = time.monotonic()
+        if changes is RESCAN:
+            pending.clear()
+            first_event = last_event = None
+            yield RESCAN
+            continue
+        changes = {path for path in changes if not _is_hidden(os.path.relpath(path, watcher.root))}
+        if changes:
+            pending |= changes
+            last_event = now
+            first_event = first_event or now
+        if pending and (now - last_event >= quiet or now - first_event >= max_delay):
+            batch, pending = pending, set()
+            first_event = last_event = None
+            yield batch
@@ -2,48 +2,333 @@
 """
 Simple Audio Asset Path Helper - No dependencies required
 Demonstrates how to reference Dropbox assets in your code
+
+Lookups go through a shared AudioAssetResolver, which finds the asset
+folder once (honouring the paths in config/assets.yaml) and preloads a
+category/filename -> path index from the manifest, so resolving hundreds
+of samples at startup does not touch the filesystem per sample. PyYAML is
+used when installed; without it the few config keys needed are read with
+a minimal parser and only the SQLite manifest backend can be indexed.
 """
 
 import os
+import re
+import sqlite3
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CONFIG = os.path.join(REPO_ROOT, 'config', 'assets.yaml')
+DEFAULT_MANIFEST = os.path.join(REPO_ROOT, 'assets', 'manifest.yaml')
+
+DEFAULT_PATHS = [
+    "~/Dropbox (Personal)/AVMI-GVSC-Audio-Assets",
+    "~/Dropbox/AVMI-GVSC-Audio-Assets",
+    "~/Dropbox (Work)/AVMI-GVSC-Audio-Assets"
+]
+
+_SCALAR_KEY = re.compile(r'^\s*(base_path|backend|sqlite_path|dev_subset_location|path|enabled):\s*"?([^"#\n]*?)"?\s*(#.*)?$')
+_LIST_ITEM = re.compile(r'^\s*-\s*"?([^"#\n]*?)"?\s*$')
+
+
+def _load_yaml(path: str):
+    try:
+        import yaml
+    except ImportError:
+        return None
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def _read_config_fallback(path: str) -> Dict:
+    """Pull the handful of keys the resolver needs out of assets.yaml without PyYAML"""
+    dropbox, mirror, manifest, development = {'alternative_paths': []}, {}, {}, {}
+    section = None
+    in_alternatives = False
+    with open(path, 'r') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.endswith(':') and not stripped.startswith('-'):
+                key = stripped[:-1]
+                in_alternatives = key == 'alternative_paths'
+                if len(line) - len(line.lstrip()) <= 2:
+                    # Top-level and asset_storage.* headers start a new section
+                    section = key
+                continue
+            item = _LIST_ITEM.match(line)
+            if in_alternatives and item:
+                dropbox['alternative_paths'].append(item.group(1))
+                continue
+            in_alternatives = False
+            match = _SCALAR_KEY.match(line)
+            if not match:
+                continue
+            key, value = match.group(1), match.group(2)
+            target = {'dropbox_shared': dropbox, 'local_mirror': mirror,
+                      'manifest': manifest, 'development': development}.get(section)
+            if target is not None:
+                target[key] = value.lower() == 'true' if key == 'enabled' else value
+    return {'asset_storage': {'dropbox_shared': dropbox, 'local_mirror': mirror},
+            'manifest': manifest, 'development': development}
+
+
+def _from_repo(path: str) -> str:
+    return os.path.join(REPO_ROOT, os.path.expanduser(path))
+
+
+class AudioAssetResolver:
+    """Resolve (category, filename) to a local path with memoised root and manifest index
+
+    Manifest entries are checked with one stat per lookup; if the file is
+    gone, the manifest is re-read once before giving up. Lookups that are
+    not in the manifest are checked on disk once and remembered.
+    """
+
+    def __init__(self, config_path: str = DEFAULT_CONFIG, manifest_path: str = DEFAULT_MANIFEST):
+        self.config_path = config_path
+        self.manifest_path = manifest_path
+        self._lock = threading.RLock()
+        self._config: Optional[Dict] = None
+        self._root: Optional[Tuple[Optional[str], str]] = None
+        self._index: Optional[Dict[Tuple[str, str], str]] = None
+        self._checksums: Dict[Tuple[str, str], str] = {}
+        self._index_source: Optional[Tuple[str, Tuple]] = None
+        self._hooks: List[Callable[[], None]] = []
+
+    # Configuration and root discovery
+
+    @property
+    def config(self) -> Dict:
+        if self._config is None:
+            try:
+                self._config = _load_yaml(self.config_path)
+                if self._config is None:
+                    self._config = _read_config_fallback(self.config_path)
+            except FileNotFoundError:
+                self._config = {}
+        return self._config
+
+    def candidate_roots(self) -> List[str]:
+        """Dropbox folder locations to try, from config/assets.yaml first"""
+        dropbox = (self.config.get('asset_storage') or {}).get('dropbox_shared') or {}
+        paths = [dropbox.get('base_path')] + list(dropbox.get('alternative_paths') or []) + DEFAULT_PATHS
+        seen = []
+        for path in paths:
+            if path and path not in seen:
+                seen.append(path)
+        return seen
+
+    def _find_root(self) -> Tuple[Optional[str], str]:
+        for path in self.candidate_roots():
+            expanded_path = os.path.expanduser(path)
+            if os.path.exists(expanded_path):
+                return expanded_path, 'dropbox'
+        mirror = (self.config.get('asset_storage') or {}).get('local_mirror') or {}
+        if mirror.get('enabled') and mirror.get('path') and os.path.exists(os.path.expanduser(mirror['path'])):
+            return os.path.expanduser(mirror['path']), 'mirror'
+        subset = (self.config.get('development') or {}).get('dev_subset_location')
+        if subset and os.path.isdir(_from_repo(subset)):
+            return _from_repo(subset), 'subset'
+        return None, 'none'
+
+    @property
+    def root(self) -> Optional[str]:
+        """The asset folder in use (Dropbox, then local mirror, then dev subset), found once"""
+        if self._root is None:
+            with self._lock:
+                if self._root is None:
+                    self._root = self._find_root()
+        return self._root[0]
+
+    @property
+    def root_kind(self) -> str:
+        """'dropbox', 'mirror', 'subset' or 'none'"""
+        if self._root is None:
+            self.root
+        return self._root[1]
+
+    # Manifest index
+
+    def _manifest_source(self) -> Tuple[str, str]:
+        """(backend, path) of the manifest the index is built from"""
+        manifest = self.config.get('manifest') or {}
+        if manifest.get('backend') == 'sqlite':
+            sqlite_path = _from_repo(manifest.get('sqlite_path', '.cache/manifest.sqlite'))
+            if os.path.exists(sqlite_path):
+                return 'sqlite', sqlite_path
+        return 'yaml', self.manifest_path
+
+    def _read_manifest(self, backend: str, path: str) -> List[Tuple[str, str, Optional[str], Optional[str]]]:
+        """Rows of (category, filename, dropbox_path, checksum)"""
+        if backend == 'sqlite':
+            connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                return connection.execute("SELECT category, name, dropbox_path, checksum FROM assets").fetchall()
+            finally:
+                connection.close()
+        try:
+            manifest = _load_yaml(path) or {}
+        except FileNotFoundError:
+            manifest = {}
+        return [(category, name, (asset or {}).get('dropbox_path'), (asset or {}).get('checksum'))
+                for category, cat_data in (manifest.get('categories') or {}).items()
+                for name, asset in ((cat_data or {}).get('assets') or {}).items()]
+
+    @staticmethod
+    def _manifest_stamp(path: str) -> Tuple:
+        """(mtime, size) of the manifest and of its SQLite write-ahead log, if any
+
+        SQLite in WAL mode commits to <path>-wal and leaves the main file
+        untouched until a checkpoint, so the log has to be watched too.
+        """
+        stamp = []
+        for name in (path, path + '-wal'):
+            try:
+                st = os.stat(name)
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _build_index(self):
+        backend, path = self._manifest_source()
+        stamp = self._manifest_stamp(path)
+        rows = self._read_manifest(backend, path)
+        root = self.root
+        index = {}
+        if root and self.root_kind in ('dropbox', 'mirror'):
+            # Both share the Dropbox layout, including .blobs/ for content-addressed entries
+            index = {(category, name): os.path.join(root, *(rel_path or f"{category}/{name}").split('/'))
+                     for category, name, rel_path, _ in rows}
+        self._checksums = {(category, name): checksum for category, name, _, checksum in rows if checksum}
+        self._index = index
+        self._index_source = (path, stamp)
+
+    @property
+    def index(self) -> Dict[Tuple[str, str], str]:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._build_index()
+        return self._index
+
+    def checksum(self, category: str, filename: str) -> Optional[str]:
+        """SHA256 recorded in the manifest for an asset, if any"""
+        self.index
+        return self._checksums.get((category, filename))
+
+    # Invalidation
+
+    def add_invalidation_hook(self, hook: Callable[[], None]):
+        """Call ``hook`` whenever cached state is dropped (e.g. to clear a sample cache)"""
+        self._hooks.append(hook)
+
+    def invalidate(self):
+        """Forget the root, config and index; the next lookup rediscovers everything"""
+        with self._lock:
+            self._config = None
+            self._root = None
+            self._index = None
+            self._index_source = None
+        for hook in self._hooks:
+            hook()
+
+    def invalidate_asset(self, category: str, filename: str):
+        """Forget one remembered path (after a file moved or was deleted)"""
+        if self._index is not None:
+            self._index.pop((category, filename), None)
+
+    def _drop_index(self):
+        with self._lock:
+            self._index = None
+        for hook in self._hooks:
+            hook()
+
+    def reload_if_stale(self) -> bool:
+        """Rebuild the index if the manifest (or its SQLite log) changed on disk; costs two stats"""
+        if self._index_source is None:
+            return False
+        path, stamp = self._index_source
+        if self._manifest_stamp(path) == stamp:
+            return False
+        self._drop_index()
+        return True
+
+    # Lookups
+
+    def resolve(self, category: str, filename: str) -> str:
+        """Get the path to an audio asset; raises FileNotFoundError"""
+        key = (category, filename)
+        path = self.index.get(key)
+        if path is not None:
+            if os.path.exists(path):
+                return path
+            # Moved or deleted since the index was built: re-read the manifest once
+            self._drop_index()
+            path = self.index.get(key)
+            if path is not None and os.path.exists(path):
+                return path
+            self.invalidate_asset(category, filename)
+
+        root = self.root
+        if not root:
+            raise FileNotFoundError(
+                "Dropbox audio assets folder not found. "
+                "Please create: ~/Dropbox/AVMI-GVSC-Audio-Assets"
+            )
+        asset_path = os.path.join(root, category, filename)
+        if not os.path.exists(asset_path):
+            raise FileNotFoundError(f"Audio asset not found: {asset_path}")
+        self.index[key] = asset_path
+        return asset_path
+
+    def resolve_many(self, assets: Iterable[Tuple[str, str]], strict: bool = True) -> Dict[Tuple[str, str], Optional[str]]:
+        """Resolve many (category, filename) pairs at once
+
+        Checks once whether the manifest changed. With ``strict=False``
+        missing assets map to None instead of raising.
+        """
+        self.reload_if_stale()
+        resolved = {}
+        for category, filename in assets:
+            try:
+                resolved[(category, filename)] = self.resolve(category, filename)
+            except FileNotFoundError:
+                if strict:
+                    raise
+                resolved[(category, filename)] = None
+        return resolved
+
+
+_default_resolver: Optional[AudioAssetResolver] = None
+
+
+def get_resolver() -> AudioAssetResolver:
+    """Shared resolver used by the module-level helpers"""
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = AudioAssetResolver()
+    return _default_resolver
+
 
 def find_dropbox_audio_assets():
     """Find the Dropbox audio assets folder"""
-    possible_paths = [
-        "~/Dropbox (Personal)/AVMI-GVSC-Audio-Assets",
-        "~/Dropbox/AVMI-GVSC-Audio-Assets",
-        "~/Dropbox (Work)/AVMI-GVSC-Audio-Assets"
-    ]
-    
-    for path in possible_paths:
-        expanded_path = os.path.expanduser(path)
-        if os.path.exists(expanded_path):
-            return expanded_path
-    
-    return None
+    return get_resolver().root
 
 def get_audio_asset_path(category, filename):
     """Get path to an audio asset"""
-    dropbox_path = find_dropbox_audio_assets()
-    
-    if not dropbox_path:
-        raise FileNotFoundError(
-            "Dropbox audio assets folder not found. "
-            "Please create: ~/Dropbox/AVMI-GVSC-Audio-Assets"
-        )
-    
-    asset_path = os.path.join(dropbox_path, category, filename)
-    
-    if not os.path.exists(asset_path):
-        raise FileNotFoundError(f"Audio asset not found: {asset_path}")
-    
-    return asset_path
+    return get_resolver().resolve(category, filename)
 
 def verify_setup():
     """Verify Dropbox setup"""
-    dropbox_path = find_dropbox_audio_assets()
+    resolver = get_resolver()
+    dropbox_path = resolver.root
     
     if dropbox_path:
-        print(f"✅ Found Dropbox audio assets folder: {dropbox_path}")
+        if resolver.root_kind == 'dropbox':
+            print(f"✅ Found Dropbox audio assets folder: {dropbox_path}")
+        else:
+            print(f"⚠️ Dropbox folder not found; using {resolver.root_kind} at {dropbox_path}")
         
         # Check subfolders
         expected_folders = ['samples', 'presets', 'templates', 'evaluation_data', 'raw_recordings', 'processed']
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Concurrent asset loading for engine startup
+
+load_assets_async reads, checksum-verifies and decodes many assets at
+once. Each file is read in one pass on a worker thread (hashlib and the
+decoders release the GIL), hashed while in memory and decoded from the
+same bytes, so every asset is read from disk exactly once. A semaphore
+bounds how many files are in flight; startup time then follows disk
+bandwidth instead of the number of files.
+
+    from scripts.audio_asset_loader import load_assets
+
+    results = load_assets([('samples', 'engine_idle_ev_001.wav'),
+                           ('samples', 'engine_rev_ev_002.wav')],
+                          sample_rate=48000)
+"""
+
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    from .audio_asset_helper import AudioAssetResolver, get_resolver
+except ImportError:
+    # Run as a plain script from scripts/
+    from audio_asset_helper import AudioAssetResolver, get_resolver
+
+DEFAULT_CONCURRENCY = 8
+
+
+class LoadedAsset(NamedTuple):
+    category: str
+    filename: str
+    path: Optional[str]
+    samples: Any = None              # float32 (frames, channels) array, or None if decode=False
+    sample_rate: Optional[int] = None
+    checksum: Optional[str] = None
+    verified: bool = False           # checksum matched the manifest
+    bytes: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _decoder():
+    """Import the NumPy-based decoder only when decoding is requested"""
+    try:
+        from .audio_decode import decode_audio_bytes, resample
+    except ImportError:
+        from audio_decode import decode_audio_bytes, resample
+    return decode_audio_bytes, resample
+
+
+def _load_one(resolver: AudioAssetResolver, category: str, filename: str, verify: bool,
+              decode: bool, sample_rate: Optional[int]) -> LoadedAsset:
+    started = time.perf_counter()
+    path = None
+    try:
+        path = resolver.resolve(category, filename)
+        with open(path, 'rb') as f:
+            data = f.read()
+        checksum = hashlib.sha256(data).hexdigest() if verify else None
+        expected = resolver.checksum(category, filename) if verify else None
+        if expected and checksum != expected:
+            raise ValueError(f"checksum mismatch (expected {expected[:12]}, got {checksum[:12]})")
+
+        samples = rate = None
+        if decode:
+            decode_audio_bytes, resample = _decoder()
+            samples, rate = decode_audio_bytes(data, path)
+            if sample_rate and rate != sample_rate:
+                samples, rate = resample(samples, rate, sample_rate), sample_rate
+    except (OSError, ValueError, RuntimeError) as e:
+        return LoadedAsset(category, filename, path, error=str(e), seconds=time.perf_counter() - started)
+    return LoadedAsset(category, filename, path, samples, rate, checksum, bool(expected), len(data),
+                       time.perf_counter() - started)
+
+
+async def load_assets_async(assets: Iterable[Tuple[str, str]], max_concurrency: int = DEFAULT_CONCURRENCY,
+                            verify: bool = True, decode: bool = True, sample_rate: Optional[int] = None,
+                            progress: Callable[[LoadedAsset, int, int], None] = None,
+                            resolver: Optional[AudioAssetResolver] = None) -> Dict[Tuple[str, str], LoadedAsset]:
+    """Load many (category, filename) assets concurrently
+
+    ``progress(result, done, total)`` is called as each asset finishes,
+    in completion order. Failures are reported in the result's ``error``
+    rather than raised, so one bad file does not abort startup.
+    """
+    resolver = resolver or get_resolver()
+    keys = list(dict.fromkeys(assets))
+    # Resolve the whole batch up front: one manifest freshness check, no per-file stat
+    resolver.resolve_many(keys, strict=False)
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results: Dict[Tuple[str, str], LoadedAsset] = {}
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        async def load(key):
+            nonlocal done
+            async with semaphore:
+                result = await loop.run_in_executor(pool, _load_one, resolver, key[0], key[1],
+                                                    verify, decode, sample_rate)
+            results[key] = result
+            done += 1
+            if progress:
+                progress(result, done, len(keys))
+
+        await asyncio.gather(*(load(key) for key in keys))
+    return {key: results[key] for key in keys}
+
+
+def load_assets(assets: Iterable[Tuple[str, str]], **kwargs) -> Dict[Tuple[str, str], LoadedAsset]:
+    """Blocking wrapper around load_assets_async for code without an event loop"""
+    return asyncio.run(load_assets_async(assets, **kwargs))
+
+
+def print_progress(result: LoadedAsset, done: int, total: int):
+    """Default console progress reporter"""
+    name = f"{result.category}/{result.filename}"
+    if result.ok:
+        check = " ✓" if result.verified else ""
+        print(f"  [{done}/{total}] 📥 {name} ({result.bytes} bytes, {result.seconds * 1000:.0f} ms){check}")
+    else:
+        print(f"  [{done}/{total}] ❌ {name}: {result.error}")
+
+
+def summarize(results: Dict[Tuple[str, str], LoadedAsset], seconds: float) -> List[str]:
+    """Human-readable summary lines for a load"""
+    total_bytes = sum(result.bytes for result in results.values())
+    failed = [result for result in results.values() if not result.ok]
+    rate = total_bytes / seconds / 1024 ** 2 if seconds else 0.0
+    lines = [f"✅ Loaded {len(results) - len(failed)}/{len(results)} assets, "
+             f"{total_bytes / 1024 ** 2:.1f} MB in {seconds:.2f}s ({rate:.0f} MB/s)"]
+    if failed:
+        lines.append(f"⚠️ {len(failed)} assets failed to load")
+    return lines
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/audio_asset_loader.py <category>/<filename> [...]")
+        sys.exit(1)
+    requested = [tuple(arg.split('/', 1)) for arg in sys.argv[1:] if '/' in arg]
+    started = time.perf_counter()
+    loaded = load_assets(requested, progress=print_progress)
+    for line in summarize(loaded, time.perf_counter() - started):
+        print(line)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Decode audio assets to float32 NumPy arrays
+
+Uses soundfile (libsndfile) when it is installed, which covers WAV, FLAC
+and AIFF. Without it, integer PCM and IEEE float WAV files are still read
+directly through NumPy using the header parser from audio_metadata.
+Resampling uses SciPy's polyphase filter when available and an FFT
+resampler otherwise.
+"""
+
+import io
+from math import gcd
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from .audio_metadata import WavLayout, read_wav_layout, wav_layout_from_stream
+except ImportError:
+    # Run as a plain script from scripts/
+    from audio_metadata import WavLayout, read_wav_layout, wav_layout_from_stream
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+
+
+def _pcm_to_float(raw: np.ndarray, layout: WavLayout, source: str) -> np.ndarray:
+    """Convert raw WAV sample bytes to float32 (frames, channels)"""
+    width = layout.block_align // layout.channels
+    order = '>' if layout.big_endian else '<'
+
+    if layout.audio_format == WAVE_FORMAT_IEEE_FLOAT and width in (4, 8):
+        samples = raw.view(f'{order}f{width}').astype(np.float32)
+    elif layout.audio_format == WAVE_FORMAT_PCM and width == 1:
+        # 8-bit WAV is unsigned
+        samples = (raw.astype(np.float32) - 128.0) / 128.0
+    elif layout.audio_format == WAVE_FORMAT_PCM and width in (2, 4):
+        samples = raw.view(f'{order}i{width}').astype(np.float32) / float(2 ** (8 * width - 1))
+    elif layout.audio_format == WAVE_FORMAT_PCM and width == 3:
+        triplets = raw.reshape(-1, 3).astype(np.int32)
+        if layout.big_endian:
+            triplets = triplets[:, ::-1]
+        # Shift into the top 24 bits of an int32 so the sign comes along
+        values = (triplets[:, 0] << 8) | (triplets[:, 1] << 16) | (triplets[:, 2] << 24)
+        samples = values.astype(np.float32) / float(2 ** 31)
+    else:
+        raise ValueError(f"Cannot decode {source}: unsupported WAV encoding "
+                         f"(format {layout.audio_format}, {layout.bits} bits)")
+    return samples.reshape(-1, layout.channels)
+
+
+def _frame_bytes(layout: WavLayout) -> int:
+    return ((layout.data_size or 0) // layout.block_align) * layout.block_align
+
+
+def _read_wav_numpy(file_path: str) -> Tuple[np.ndarray, int]:
+    layout = read_wav_layout(file_path)
+    if not layout or layout.data_offset is None:
+        raise ValueError(f"Cannot decode {file_path}: not a WAV file (install soundfile for FLAC/AIFF)")
+    raw = np.fromfile(file_path, dtype=np.uint8, count=_frame_bytes(layout), offset=layout.data_offset)
+    return _pcm_to_float(raw, layout, file_path), layout.sample_rate
+
+
+def read_audio(file_path: str) -> Tuple[np.ndarray, int]:
+    """Decode a file to a float32 array shaped (frames, channels); returns (samples, sample_rate)"""
+    try:
+        import soundfile
+    except ImportError:
+        return _read_wav_numpy(file_path)
+    samples, sample_rate = soundfile.read(file_path, dtype='float32', always_2d=True)
+    return samples, sample_rate
+
+
+def decode_audio_bytes(data: bytes, name: str = '<bytes>') -> Tuple[np.ndarray, int]:
+    """Decode an in-memory file, as read_audio does for paths"""
+    try:
+        import soundfile
+    except ImportError:
+        layout = wav_layout_from_stream(io.BytesIO(data))
+        if not layout or layout.data_offset is None:
+            raise ValueError(f"Cannot decode {name}: not a WAV file (install soundfile for FLAC/AIFF)")
+        raw = np.frombuffer(data, dtype=np.uint8, count=_frame_bytes(layout), offset=layout.data_offset)
+        return _pcm_to_float(raw, layout, name), layout.sample_rate
+    samples, sample_rate = soundfile.read(io.BytesIO(data), dtype='float32', always_2d=True)
+    return samples, sample_rate
+
+
+def resample(samples: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """Resample (frames, channels) float32 audio along the time axis"""
+    if from_rate == to_rate or not len(samples):
+        return samples
+    try:
+        from scipy.signal import resample_poly
+    except ImportError:
+        resample_poly = None
+    if resample_poly is not None:
+        divisor = gcd(to_rate, from_rate)
+        return resample_poly(samples, to_rate // divisor, from_rate // divisor, axis=0).astype(np.float32)
+
+    # Band-limited FFT resampling, one channel at a time to bound memory
+    n_out = int(round(len(samples) * to_rate / from_rate))
+    out = np.empty((n_out, samples.shape[1]), dtype=np.float32)
+    for channel in range(samples.shape[1]):
+        spectrum = np.fft.rfft(samples[:, channel])
+        out[:, channel] = np.fft.irfft(spectrum, n=n_out) * (n_out / len(samples))
+    return out
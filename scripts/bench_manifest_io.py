@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark manifest YAML load/dump: pure-Python PyYAML vs libyaml C bindings
+
+Builds a synthetic manifest shaped like assets/manifest.yaml and times a
+full load and dump with each implementation.
+
+Usage:
+    python scripts/bench_manifest_io.py
+    python scripts/bench_manifest_io.py --entries 5000 --repeat 3
+"""
+
+import io
+import sys
+import time
+import argparse
+
+import yaml
+
+CATEGORIES = ['samples', 'presets', 'templates', 'evaluation_data', 'raw_recordings', 'processed']
+
+
+def synthetic_manifest(entries: int) -> dict:
+    """Build a manifest with ``entries`` assets spread across the standard categories"""
+    categories = {name: {'description': f'{name} assets', 'count': 0, 'assets': {}} for name in CATEGORIES}
+    for i in range(entries):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        filename = f"recording_{i:06d}.wav"
+        size = 1_000_000 + i * 37
+        categories[category]['assets'][filename] = {
+            'dropbox_path': f"{category}/{filename}",
+            'size_bytes': size,
+            'size_human': f"{size / 1024 / 1024:.1f}MB",
+            'checksum': f"{i:064x}",
+            'created': '2025-09-20T10:00:00',
+            'metadata': {
+                'sample_rate': 48000,
+                'duration': 30.5,
+                'channels': 2,
+                'format': 'WAV',
+                'recording_date': '2025-09-15',
+                'location': 'GVSC Test Track',
+                'vehicle_type': 'Electric Vehicle',
+            },
+        }
+    for category in categories.values():
+        category['count'] = len(category['assets'])
+    return {'version': '1.0', 'last_updated': '2025-09-20', 'dropbox_folder': 'AVMI-GVSC-Audio-Assets',
+            'categories': categories}
+
+
+def best_of(repeat: int, func) -> float:
+    """Return the fastest of ``repeat`` runs of func(), in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark manifest YAML load/dump implementations")
+    parser.add_argument('--entries', type=int, default=50000, help='Number of synthetic assets')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    implementations = [('pure Python', yaml.SafeLoader, yaml.SafeDumper)]
+    if hasattr(yaml, 'CSafeLoader'):
+        implementations.append(('libyaml (C)', yaml.CSafeLoader, yaml.CSafeDumper))
+    else:
+        print("⚠️ PyYAML was built without libyaml; only the pure-Python path is available")
+
+    manifest = synthetic_manifest(args.entries)
+    text = yaml.dump(manifest, Dumper=implementations[-1][2], default_flow_style=False, indent=2)
+    print(f"📄 Synthetic manifest: {args.entries} assets, {len(text) / 1024 / 1024:.1f}MB of YAML")
+
+    results = {}
+    for name, loader, dumper in implementations:
+        load_s = best_of(args.repeat, lambda: yaml.load(text, Loader=loader))
+        dump_s = best_of(args.repeat, lambda: yaml.dump(manifest, io.StringIO(), Dumper=dumper,
+                                                        default_flow_style=False, indent=2))
+        results[name] = (load_s, dump_s)
+        print(f"  {name:<12} load {load_s:7.2f}s   dump {dump_s:7.2f}s")
+
+    if len(results) == 2:
+        (py_load, py_dump), (c_load, c_dump) = results.values()
+        print(f"🚀 Speedup: load {py_load / c_load:.1f}x, dump {py_dump / c_dump:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
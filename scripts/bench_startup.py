@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Start-up benchmark for asset_manager.py
+
+Runs quick commands under ``python -X importtime`` and reports how long
+imports took and how long the whole command ran, each measured over a
+bare ``python -c pass`` baseline so interpreter start-up (which differs
+between machines and is outside our control) is not charged to the
+script. A command fails the check if it imports a module it has no use
+for (PyYAML, NumPy, the HTTP client, ...), which is how an accidental
+top-level import usually shows up. Timings are reported, and only fail
+the check when a budget is given with --budget-ms.
+
+Commands run in a throwaway directory with their own HOME, config and
+Dropbox folder, so ``verify`` never touches the real asset folder.
+
+Usage:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --budget-ms 60 --runs 10
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANAGER = os.path.join(REPO_ROOT, 'scripts', 'asset_manager.py')
+CONFIG = os.path.join(REPO_ROOT, 'config', 'assets.yaml')
+
+COMMANDS = [['--help'], ['verify']]
+BASELINE = ['-c', 'pass']
+# Nothing on the quick paths needs these; each costs milliseconds to import
+FORBIDDEN_MODULES = {'yaml', 'numpy', 'sqlite3', 'urllib.request', 'ctypes', 'concurrent.futures',
+                     'json', 'manifest_store', 'asset_io', 'asset_cache', 'asset_query',
+                     'asset_transfer', 'asset_watch', 'asset_subset', 'blob_store'}
+
+
+class Sandbox(NamedTuple):
+    """Working directory and environment the benchmarked commands run in"""
+    cwd: str
+    env: Dict[str, str]
+
+
+def make_sandbox(root: str) -> Sandbox:
+    """Copy the repo config into ``root``, pointing every asset location inside it"""
+    import yaml
+    with open(CONFIG) as f:
+        config = yaml.safe_load(f)
+    dropbox_path = os.path.join(root, 'Dropbox', 'AVMI-GVSC-Audio-Assets')
+    os.makedirs(dropbox_path)
+    storage = config.setdefault('asset_storage', {})
+    dropbox_config = storage.setdefault('dropbox_shared', {})
+    dropbox_config['base_path'] = dropbox_path
+    dropbox_config['alternative_paths'] = []
+    storage['local_mirror'] = {'enabled': False}
+    os.makedirs(os.path.join(root, 'config'))
+    with open(os.path.join(root, 'config', 'assets.yaml'), 'w') as f:
+        yaml.safe_dump(config, f)
+    return Sandbox(root, {**os.environ, 'HOME': root})
+
+
+def import_times(argv: List[str], sandbox: Sandbox) -> Dict[str, int]:
+    """Run the interpreter on argv under -X importtime; return {module: self time in µs}"""
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + argv, cwd=sandbox.cwd, env=sandbox.env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def fastest_import_times(argv: List[str], sandbox: Sandbox, runs: int) -> Dict[str, int]:
+    """import_times of the run with the lowest total, to keep scheduler noise out"""
+    return min((import_times(argv, sandbox) for _ in range(runs)), key=lambda times: sum(times.values()))
+
+
+def wall_time(argv: List[str], sandbox: Sandbox, runs: int) -> float:
+    """Best-of-N wall-clock seconds for running the interpreter on argv"""
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + argv, cwd=sandbox.cwd, env=sandbox.env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def baseline(sandbox: Sandbox, runs: int) -> Tuple[Dict[str, int], float]:
+    """Import times and best wall-clock seconds of a bare interpreter"""
+    return fastest_import_times(BASELINE, sandbox, runs), wall_time(BASELINE, sandbox, runs)
+
+
+def check(command: List[str], sandbox: Sandbox, runs: int, base: Tuple[Dict[str, int], float],
+          budget_ms: Optional[float] = None) -> Tuple[bool, List[str]]:
+    """Benchmark one command against the baseline; return (passed, report lines)"""
+    argv = [MANAGER] + command
+    # The first run parses the config and fills .cache/config; measure a warm start
+    import_times(argv, sandbox)
+    times = fastest_import_times(argv, sandbox, runs)
+    base_times, base_wall = base
+    # Modules the interpreter imports on its own are start-up cost, not ours
+    own = {name: us for name, us in times.items() if name not in base_times}
+    import_ms = sum(own.values()) / 1000
+    wall = wall_time(argv, sandbox, runs)
+    forbidden = sorted(FORBIDDEN_MODULES.intersection(times))
+    slowest = sorted(own.items(), key=lambda item: item[1], reverse=True)[:5]
+
+    over_budget = budget_ms is not None and import_ms > budget_ms
+    passed = not forbidden and not over_budget
+    budget = f", budget {budget_ms:.0f} ms" if budget_ms is not None else ""
+    lines = [f"{'✅' if passed else '❌'} asset_manager.py {' '.join(command)}: "
+             f"+{import_ms:.1f} ms importing {len(own)} modules, +{(wall - base_wall) * 1000:.0f} ms wall "
+             f"({wall / base_wall:.1f}× the bare interpreter{budget})"]
+    lines.append("   slowest: " + ", ".join(f"{name} {us / 1000:.1f} ms" for name, us in slowest))
+    if forbidden:
+        lines.append(f"   ⚠️ imports modules it does not need: {', '.join(forbidden)}")
+    return passed, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check asset_manager.py start-up time")
+    parser.add_argument('--budget-ms', type=float,
+                        help='Fail when import time over the python -c pass baseline exceeds this (ms)')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per command; the fastest is reported')
+    args = parser.parse_args()
+
+    all_passed = True
+    with tempfile.TemporaryDirectory(prefix='bench_startup.') as root:
+        sandbox = make_sandbox(root)
+        base = baseline(sandbox, args.runs)
+        print(f"📏 python -c pass baseline: {sum(base[0].values()) / 1000:.1f} ms importing "
+              f"{len(base[0])} modules, {base[1] * 1000:.0f} ms wall")
+        for command in COMMANDS:
+            passed, lines = check(command, sandbox, args.runs, base, args.budget_ms)
+            all_passed = all_passed and passed
+            for line in lines:
+                print(line)
+    sys.exit(0 if all_passed else 1)
+
+
+if __name__ == "__main__":
+    main()
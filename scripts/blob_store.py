@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Content-addressed blob storage for audio assets
+
+Each unique file is stored once under <dropbox>/.blobs/sha256/ab/<checksum>
+and manifest entries point at it through their 'blob' field. Registering
+the same take under another name, or in another category, costs no extra
+bytes and skips the copy entirely. The folder is hidden so scans of the
+category folders never pick blobs up as untracked assets.
+"""
+
+import os
+import uuid
+from typing import Optional, Tuple
+
+from asset_io import copy_and_hash, hash_file
+
+BLOB_DIR = '.blobs'
+
+
+class BlobStore:
+    """One file per unique SHA256 checksum"""
+
+    def __init__(self, dropbox_path: str):
+        self.dropbox_path = dropbox_path
+        self.root = os.path.join(dropbox_path, BLOB_DIR)
+
+    @staticmethod
+    def relative_path(checksum: str) -> str:
+        """Blob location relative to the Dropbox folder (the manifest 'dropbox_path')"""
+        return f"{BLOB_DIR}/sha256/{checksum[:2]}/{checksum}"
+
+    def path(self, checksum: str) -> str:
+        """Full filesystem path of a blob"""
+        return os.path.join(self.dropbox_path, self.relative_path(checksum))
+
+    def contains(self, checksum: str) -> bool:
+        return os.path.exists(self.path(checksum))
+
+    def put(self, source_path: str, checksum: Optional[str] = None) -> Tuple[str, str, Optional[str]]:
+        """Store a file by content, returning (blob_path, checksum, copy_method)
+
+        copy_method is None when the blob already existed. If the checksum
+        is already known and stored, nothing is read; if it is unknown, the
+        file is hashed read-only first, so content that is already stored
+        is never written into the synced folder. New content is copied and
+        hashed again in one pass into .blobs/tmp/, then renamed to the
+        checksum of the bytes actually copied, so a blob path only ever
+        holds complete content.
+        """
+        if not checksum:
+            checksum = hash_file(source_path)
+        if self.contains(checksum):
+            return self.path(checksum), checksum, None
+
+        staging_dir = os.path.join(self.root, 'tmp')
+        os.makedirs(staging_dir, exist_ok=True)
+        staging_path = os.path.join(staging_dir, uuid.uuid4().hex)
+        try:
+            # Never hardlink: a later in-place edit of the source would silently
+            # change content that is addressed by its old checksum
+            method, checksum = copy_and_hash(source_path, staging_path, allow_hardlink=False)
+            blob_path = self.path(checksum)
+            if os.path.exists(blob_path):
+                return blob_path, checksum, None
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            os.replace(staging_path, blob_path)
+            return blob_path, checksum, method
+        finally:
+            if os.path.exists(staging_path):
+                os.unlink(staging_path)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Accuracy check for the non-uniform partitioned convolver
+
+Convolves a random signal block by block and compares the result with
+np.convolve. Block sizes that are not powers of two (480 is 10 ms at
+48 kHz) and partition caps they do not divide are included, since those
+are where stage sizes and block boundaries can drift apart.
+
+Usage:
+    python scripts/check_convolution.py
+"""
+
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.dsp_algorithms.nonuniform_convolution import relative_error
+
+# (block size, max partition)
+CASES = [(512, 8192), (480, 8192), (441, 5000)]
+TOLERANCE = 1e-5
+
+
+def main():
+    all_passed = True
+    for block_size, max_partition in CASES:
+        error = relative_error(block_size, taps=40000, frames=60000, max_partition=max_partition)
+        passed = error < TOLERANCE
+        all_passed = all_passed and passed
+        print(f"{'✅' if passed else '❌'} block {block_size}, max partition {max_partition}: "
+              f"relative error {error:.1e}")
+    sys.exit(0 if all_passed else 1)
+
+
+if __name__ == "__main__":
+    main()
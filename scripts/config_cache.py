@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Parsed-config cache for fast CLI startup
+
+Parsing config/assets.yaml means importing PyYAML and running its loader
+on every invocation, which dominates the start-up time of quick commands
+such as ``verify``. load_cached_config parses a config file once and
+keeps a pickled copy in .cache/config, keyed on the file's modification
+time and size; later runs unpickle it without importing yaml at all.
+Editing the YAML file changes its key, so the next run re-parses it.
+"""
+
+import os
+import pickle
+from typing import Dict
+
+DEFAULT_CONFIG_CACHE = ".cache/config"
+
+
+def _cache_path(config_path: str, cache_dir: str) -> str:
+    name = os.path.abspath(config_path).strip(os.sep).replace(os.sep, '__')
+    return os.path.join(cache_dir, f"{name}.pickle")
+
+
+def load_cached_config(config_path: str, cache_dir: str = DEFAULT_CONFIG_CACHE) -> Dict:
+    """Return the parsed YAML at config_path, re-parsing only when the file changed"""
+    st = os.stat(config_path)
+    key = (st.st_mtime_ns, st.st_size)
+    cache_path = _cache_path(config_path, cache_dir)
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, config = pickle.load(f)
+        if cached_key == key:
+            return config
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+        pass
+
+    from asset_io import atomic_write
+    from manifest_store import yaml_load
+    with open(config_path, 'r') as f:
+        config = yaml_load(f)
+    try:
+        with atomic_write(cache_path, 'wb') as f:
+            pickle.dump((key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        # A read-only checkout still works, it just parses every time
+        pass
+    return config
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Cache of decoded, resampled audio stored as memory-mappable .npy files
+
+Loading a WAV with librosa decodes and resamples it on every run. This
+cache does that once per asset: the samples are decoded, resampled to the
+project rate (audio.sample_rate in config/config.yaml) and saved as a
+float32 (frames, channels) array named after the asset checksum and rate.
+Later loads are np.load(..., mmap_mode='r'), so no decoding happens and
+pages are read lazily, straight from the OS page cache.
+"""
+
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from asset_io import DEFAULT_JOBS, atomic_write
+from audio_decode import read_audio, resample
+from manifest_store import yaml_load
+
+DEFAULT_DECODED_CACHE = ".cache/decoded"
+DEFAULT_SAMPLE_RATE = 48000
+
+
+def project_sample_rate(config_path: str = "config/config.yaml") -> int:
+    """Target sample rate from the project config (audio.sample_rate)"""
+    try:
+        with open(config_path, 'r') as f:
+            config = yaml_load(f) or {}
+    except FileNotFoundError:
+        return DEFAULT_SAMPLE_RATE
+    return int((config.get('audio') or {}).get('sample_rate', DEFAULT_SAMPLE_RATE))
+
+
+class DecodedCache:
+    """float32 .npy copies of assets, keyed by checksum and sample rate"""
+
+    def __init__(self, cache_dir: str = DEFAULT_DECODED_CACHE, sample_rate: int = DEFAULT_SAMPLE_RATE):
+        self.cache_dir = cache_dir
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def from_config(cls, config: Dict, project_config_path: str = "config/config.yaml") -> 'DecodedCache':
+        development = (config or {}).get('development', {}) or {}
+        return cls(development.get('decoded_cache_location', DEFAULT_DECODED_CACHE),
+                   project_sample_rate(project_config_path))
+
+    def path(self, checksum: str, sample_rate: Optional[int] = None) -> str:
+        return os.path.join(self.cache_dir, checksum[:2], f"{checksum}.{sample_rate or self.sample_rate}.npy")
+
+    def contains(self, checksum: str, sample_rate: Optional[int] = None) -> bool:
+        return os.path.exists(self.path(checksum, sample_rate))
+
+    def load(self, checksum: str, sample_rate: Optional[int] = None) -> Optional[np.memmap]:
+        """Memory-map a cached array, or return None if it has not been decoded yet"""
+        try:
+            return np.load(self.path(checksum, sample_rate), mmap_mode='r')
+        except FileNotFoundError:
+            return None
+
+    def decode(self, source_path: str, checksum: str, sample_rate: Optional[int] = None) -> Tuple[np.memmap, bool]:
+        """Return the cached array for an asset, decoding source_path first if needed
+
+        Returns (samples, decoded) where ``decoded`` tells whether this call
+        had to decode the file.
+        """
+        cached = self.load(checksum, sample_rate)
+        if cached is not None:
+            return cached, False
+
+        sample_rate = sample_rate or self.sample_rate
+        samples, source_rate = read_audio(source_path)
+        samples = np.ascontiguousarray(resample(samples, source_rate, sample_rate), dtype=np.float32)
+        cached_path = self.path(checksum, sample_rate)
+        with atomic_write(cached_path, 'wb') as f:
+            np.save(f, samples)
+        return np.load(cached_path, mmap_mode='r'), True
+
+    def decode_many(self, items: Iterable[Tuple[str, str]], jobs: Optional[int] = None,
+                    sample_rate: Optional[int] = None) -> Dict[str, Optional[str]]:
+        """Decode (source_path, checksum) pairs concurrently; returns {checksum: error or None}"""
+        def work(item):
+            source_path, checksum = item
+            try:
+                self.decode(source_path, checksum, sample_rate)
+                return checksum, None
+            except (OSError, ValueError, RuntimeError) as e:
+                return checksum, str(e)
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs or DEFAULT_JOBS)) as pool:
+            return dict(pool.map(work, items))
+
+    @property
+    def total_size(self) -> int:
+        total = 0
+        for dir_path, _, file_names in os.walk(self.cache_dir):
+            total += sum(os.path.getsize(os.path.join(dir_path, name)) for name in file_names)
+        return total
+
+    def clear(self) -> int:
+        """Remove every decoded array; return bytes freed"""
+        freed = self.total_size
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        return freed
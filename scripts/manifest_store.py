@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Manifest storage backends for the audio asset manager
+
+Two interchangeable stores are provided:
+
+- YamlManifestStore: the original assets/manifest.yaml, rewritten in full
+  on every change. Simple and diff-friendly, but O(N) per registration.
+- SqliteManifestStore: an indexed local database (by category, filename
+  and checksum) where adding an asset is a single upsert. The YAML file
+  remains the reviewable copy in git via import/export.
+
+Both stores expose load(), save(manifest) and put_assets(...); the
+``incremental`` flag tells callers whether put_assets can persist a few
+entries without the full manifest being loaded. Writes to the YAML file
+are atomic (temp file + rename), so an interrupted run never leaves a
+truncated manifest behind. YAML is parsed and emitted with libyaml's C
+loader/dumper when PyYAML was built with it, falling back to the
+pure-Python implementation otherwise.
+"""
+
+import os
+import json
+import sqlite3
+from datetime import datetime
+from typing import Dict, IO, List, Optional
+
+import yaml
+
+from asset_io import atomic_write
+
+# libyaml bindings are an optional part of PyYAML; same output, several times faster
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+LIBYAML = YAML_LOADER is not yaml.SafeLoader
+
+# Asset fields stored in their own columns; anything else goes to 'extra'
+ASSET_COLUMNS = ['dropbox_path', 'size_bytes', 'size_human', 'checksum', 'created']
+
+
+def empty_manifest() -> Dict:
+    """Return a new manifest with no categories"""
+    return {
+        'version': '1.0',
+        'last_updated': datetime.now().isoformat(),
+        'dropbox_folder': 'AVMI-GVSC-Audio-Assets',
+        'categories': {}
+    }
+
+
+def new_category(name: str) -> Dict:
+    """Return an empty category block"""
+    return {
+        'description': f'{name} assets',
+        'count': 0,
+        'assets': {}
+    }
+
+
+def yaml_load(stream: IO):
+    """Parse a YAML document with the fastest available safe loader"""
+    return yaml.load(stream, Loader=YAML_LOADER)
+
+
+def yaml_dump(data, stream: IO):
+    """Emit a YAML document in manifest style with the fastest available safe dumper"""
+    yaml.dump(data, stream, Dumper=YAML_DUMPER, default_flow_style=False, indent=2)
+
+
+def load_yaml_manifest(path: str) -> Optional[Dict]:
+    """Load a YAML manifest, returning None if the file does not exist"""
+    try:
+        with open(path, 'r') as f:
+            return yaml_load(f)
+    except FileNotFoundError:
+        return None
+
+
+def dump_yaml_manifest(manifest: Dict, path: str):
+    """Write a YAML manifest atomically"""
+    with atomic_write(path) as f:
+        yaml_dump(manifest, f)
+
+
+class YamlManifestStore:
+    """Manifest stored as a single YAML document"""
+
+    incremental = False
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Dict:
+        return load_yaml_manifest(self.path) or empty_manifest()
+
+    def save(self, manifest: Dict):
+        manifest['last_updated'] = datetime.now().isoformat()
+        dump_yaml_manifest(manifest, self.path)
+
+    def put_assets(self, manifest: Dict, changes: Dict[str, Dict[str, Dict]]):
+        """Persist entries already merged into ``manifest`` (full rewrite)"""
+        self.save(manifest)
+
+
+class SqliteManifestStore:
+    """Manifest stored in an indexed SQLite database"""
+
+    incremental = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS categories (
+            name TEXT PRIMARY KEY,
+            description TEXT
+        );
+        CREATE TABLE IF NOT EXISTS assets (
+            category TEXT NOT NULL,
+            name TEXT NOT NULL,
+            dropbox_path TEXT,
+            size_bytes INTEGER,
+            size_human TEXT,
+            checksum TEXT,
+            created TEXT,
+            metadata TEXT,
+            extra TEXT,
+            PRIMARY KEY (category, name)  -- doubles as the category index
+        );
+        CREATE INDEX IF NOT EXISTS idx_assets_name ON assets (name);
+        CREATE INDEX IF NOT EXISTS idx_assets_checksum ON assets (checksum);
+        -- The manifest.yaml this database last matched, and whether it has changed since
+        CREATE TABLE IF NOT EXISTS yaml_sync (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            mtime_ns INTEGER,
+            size INTEGER,
+            dirty INTEGER NOT NULL DEFAULT 0
+        );
+    """
+
+    def __init__(self, db_path: str, yaml_path: Optional[str] = None):
+        self.db_path = db_path
+        self.yaml_path = yaml_path
+        # Set when manifest.yaml changed since the last import/export (e.g. after git pull):
+        # reimported_yaml if the database had no local changes and was reloaded from it,
+        # yaml_conflict if both sides changed and export_yaml() would overwrite the YAML
+        self.reimported_yaml = False
+        self.yaml_conflict = False
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        is_new = not os.path.exists(db_path)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+        # Seed a fresh database from the YAML manifest tracked in git
+        if is_new and yaml_path:
+            self.import_yaml(yaml_path)
+        elif yaml_path and self._yaml_stamp() != self._synced_stamp():
+            if self._is_dirty():
+                self.yaml_conflict = True
+            else:
+                self.reimported_yaml = self.import_yaml(yaml_path)
+
+    def close(self):
+        self.conn.close()
+
+    # YAML sync state
+
+    def _yaml_stamp(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.yaml_path)
+        except (OSError, TypeError):
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _synced_stamp(self) -> Optional[tuple]:
+        row = self.conn.execute("SELECT mtime_ns, size FROM yaml_sync WHERE id = 0").fetchone()
+        return (row['mtime_ns'], row['size']) if row and row['mtime_ns'] is not None else None
+
+    def _is_dirty(self) -> bool:
+        row = self.conn.execute("SELECT dirty FROM yaml_sync WHERE id = 0").fetchone()
+        # A database from before sync tracking: assume it holds changes worth keeping
+        return row is None or bool(row['dirty'])
+
+    def _mark_synced(self, yaml_path: str):
+        self.yaml_path = yaml_path
+        stamp = self._yaml_stamp() or (None, None)
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO yaml_sync (id, mtime_ns, size, dirty) VALUES (0, ?, ?, 0)",
+                              stamp)
+        self.yaml_conflict = False
+
+    def _mark_dirty(self):
+        self.conn.execute("INSERT INTO yaml_sync (id, dirty) VALUES (0, 1) "
+                          "ON CONFLICT (id) DO UPDATE SET dirty = 1")
+
+    # Row conversion
+
+    @staticmethod
+    def _asset_row(category: str, name: str, info: Dict) -> tuple:
+        extra = {k: v for k, v in info.items() if k not in ASSET_COLUMNS and k != 'metadata'}
+        return (
+            category, name,
+            *(info.get(column) for column in ASSET_COLUMNS),
+            json.dumps(info.get('metadata') or {}, default=str),
+            json.dumps(extra, default=str) if extra else None,
+        )
+
+    @staticmethod
+    def _asset_info(row: sqlite3.Row) -> Dict:
+        info = {column: row[column] for column in ASSET_COLUMNS if row[column] is not None}
+        if row['extra']:
+            info.update(json.loads(row['extra']))
+        info['metadata'] = json.loads(row['metadata']) if row['metadata'] else {}
+        return info
+
+    def _set_meta(self, key: str, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (key, json.dumps(value, default=str)))
+
+    # Store interface
+
+    def load(self) -> Dict:
+        manifest = empty_manifest()
+        for row in self.conn.execute("SELECT key, value FROM meta"):
+            manifest[row['key']] = json.loads(row['value'])
+
+        categories = {}
+        for row in self.conn.execute("SELECT name, description FROM categories ORDER BY name"):
+            category = new_category(row['name'])
+            if row['description'] is not None:
+                category['description'] = row['description']
+            categories[row['name']] = category
+        for row in self.conn.execute("SELECT * FROM assets ORDER BY category, name"):
+            category = categories.setdefault(row['category'], new_category(row['category']))
+            category['assets'][row['name']] = self._asset_info(row)
+        for category in categories.values():
+            category['count'] = len(category['assets'])
+
+        manifest['categories'] = categories
+        return manifest
+
+    def save(self, manifest: Dict, touch: bool = True):
+        """Replace the whole database contents with ``manifest``"""
+        if touch:
+            manifest['last_updated'] = datetime.now().isoformat()
+        with self.conn:
+            if touch:
+                self._mark_dirty()
+            self.conn.execute("DELETE FROM meta")
+            self.conn.execute("DELETE FROM categories")
+            self.conn.execute("DELETE FROM assets")
+            for key, value in manifest.items():
+                if key != 'categories':
+                    self._set_meta(key, value)
+            for name, category in (manifest.get('categories') or {}).items():
+                self.conn.execute(
+                    "INSERT INTO categories (name, description) VALUES (?, ?)",
+                    (name, category.get('description')))
+                self.conn.executemany(
+                    "INSERT INTO assets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self._asset_row(name, asset_name, info)
+                     for asset_name, info in (category.get('assets') or {}).items()))
+
+    def put_assets(self, manifest: Optional[Dict], changes: Dict[str, Dict[str, Dict]]):
+        """Upsert only the given {category: {name: info}} entries in one transaction
+
+        ``manifest`` is not needed and may be None.
+        """
+        with self.conn:
+            for category, assets in changes.items():
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO categories (name, description) VALUES (?, ?)",
+                    (category, new_category(category)['description']))
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self._asset_row(category, name, info) for name, info in assets.items()))
+            self._set_meta('last_updated', datetime.now().isoformat())
+            self._mark_dirty()
+
+    # Indexed lookups
+
+    def find_by_checksum(self, checksum: str) -> List[Dict]:
+        """Return every asset with the given checksum"""
+        rows = self.conn.execute("SELECT * FROM assets WHERE checksum = ?", (checksum,))
+        return [dict(self._asset_info(row), category=row['category'], name=row['name']) for row in rows]
+
+    def find_by_name(self, name: str, category: Optional[str] = None) -> List[Dict]:
+        """Return assets with the given filename, optionally within one category"""
+        if category:
+            rows = self.conn.execute(
+                "SELECT * FROM assets WHERE category = ? AND name = ?", (category, name))
+        else:
+            rows = self.conn.execute("SELECT * FROM assets WHERE name = ?", (name,))
+        return [dict(self._asset_info(row), category=row['category'], name=row['name']) for row in rows]
+
+    # YAML interchange
+
+    def import_yaml(self, yaml_path: str) -> bool:
+        """Replace the database contents with a YAML manifest"""
+        manifest = load_yaml_manifest(yaml_path)
+        if manifest is None:
+            return False
+        self.save(manifest, touch=False)
+        self._mark_synced(yaml_path)
+        return True
+
+    def export_yaml(self, yaml_path: str, force: bool = False):
+        """Write the database contents as a YAML manifest for git review
+
+        Refuses (ValueError) when the YAML changed since the last sync and
+        the database has local changes too, unless ``force`` is set.
+        """
+        if self.yaml_conflict and not force:
+            raise ValueError(f"{yaml_path} changed since the database was last synced with it")
+        dump_yaml_manifest(self.load(), yaml_path)
+        self._mark_synced(yaml_path)
+
+
+def open_manifest_store(config: Dict, yaml_path: str):
+    """Create the manifest store selected by the ``manifest.backend`` config key"""
+    manifest_config = (config or {}).get('manifest', {}) or {}
+    backend = manifest_config.get('backend', 'yaml')
+    if backend == 'sqlite':
+        db_path = manifest_config.get('sqlite_path', '.cache/manifest.sqlite')
+        return SqliteManifestStore(db_path, yaml_path)
+    if backend != 'yaml':
+        raise ValueError(f"Unknown manifest backend: {backend}")
+    return YamlManifestStore(yaml_path)
@@ -20,9 +20,11 @@ def check_with_pyyaml(path: Path) -> int:
     except Exception as e:
         print('PyYAML import failed:', e)
         return 2
+    # Prefer the libyaml C loader when PyYAML was built with it
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
     try:
         with path.open('r', encoding='utf8') as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=loader)
     except Exception as e:
         print('Failed to parse YAML with PyYAML:', e)
         return 3
@@ -1,3 +1,9 @@
 """
 Digital Signal Processing algorithms for real-time audio processing
 """
+
+from .graph import BlockSettings, CompiledGraph, DSPGraph, GainNode, InputNode, MixNode, Node
+from .convolution import ConvolverNode, UniformPartitionedConvolver
+from .nonuniform_convolution import NonUniformConvolverNode, NonUniformPartitionedConvolver
+from .filter_bank import FilterBankNode, SOSFilterBank
+from .ring_buffer import RingBuffer, RingReaderNode
@@ -0,0 +1,141 @@
+"""
+Uniformly partitioned FFT convolution for long impulse responses
+
+The impulse response is cut into P partitions of one block (N samples)
+each, and the rfft of every partition, zero-padded to 2N, is computed
+once. Each incoming block is transformed once too and pushed onto a
+frequency-domain delay line (FDL) holding the last P input spectra. The
+output spectrum is the sum over partitions of IR spectrum times delayed
+input spectrum; one inverse FFT and overlap-save (keep the last N
+samples) turn it back into a block. Per-block cost is one forward and
+one inverse 2N-point FFT plus P·(N + 1) complex multiply-adds per
+channel, and the output is ready as soon as the input block is, so no
+latency is added beyond the block itself.
+
+The FDL is stored twice over (2P slots, each spectrum written at i and
+i + P), which makes the last P spectra one contiguous slice in newest-
+first order, lined up with the partition spectra for a single vectorized
+multiply and sum.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .graph import BlockSettings, Node, check_broadcast
+
+# NumPy 2 FFTs accept out=, which keeps process() allocation-free
+FFT_HAS_OUT = int(np.__version__.split('.')[0]) >= 2
+
+
+def rfft_into(frame: np.ndarray, out: np.ndarray):
+    """rfft along the last axis, written into ``out``"""
+    if FFT_HAS_OUT:
+        np.fft.rfft(frame, axis=-1, out=out)
+    else:
+        out[...] = np.fft.rfft(frame, axis=-1)
+
+
+def irfft_into(spectrum: np.ndarray, out: np.ndarray):
+    """irfft of length out.shape[-1] along the last axis, written into ``out``"""
+    if FFT_HAS_OUT:
+        np.fft.irfft(spectrum, n=out.shape[-1], axis=-1, out=out)
+    else:
+        out[...] = np.fft.irfft(spectrum, n=out.shape[-1], axis=-1)
+
+
+def partition_spectra(ir: np.ndarray, partition_size: int, fft_size: int) -> np.ndarray:
+    """rfft of consecutive IR partitions; (taps,) or (channels, taps) -> (P, channels, fft_size//2 + 1)"""
+    ir = np.atleast_2d(np.asarray(ir, dtype=np.float64))
+    count = max(1, -(-ir.shape[1] // partition_size))
+    padded = np.zeros((ir.shape[0], count * partition_size))
+    padded[:, :ir.shape[1]] = ir
+    partitions = np.zeros((count, ir.shape[0], fft_size))
+    partitions[:, :, :partition_size] = padded.reshape(ir.shape[0], count, partition_size).transpose(1, 0, 2)
+    return np.fft.rfft(partitions, axis=-1).astype(np.complex64)
+
+
+class UniformPartitionedConvolver:
+    """Overlap-save convolution of (channels, block_size) blocks with a fixed IR
+
+    ``ir`` is either one response shared by every channel, shaped (taps,),
+    or one per channel, shaped (channels, taps).
+    """
+
+    def __init__(self, ir: np.ndarray, block_size: int, channels: int):
+        ir = np.asarray(ir)
+        if ir.ndim == 2 and ir.shape[0] not in (1, channels):
+            raise ValueError(f"IR has {ir.shape[0]} channels, expected 1 or {channels}")
+        self.block_size = block_size
+        self.channels = channels
+        self.taps = ir.shape[-1]
+        fft_size = 2 * block_size
+        bins = block_size + 1
+
+        spectra = partition_spectra(ir, block_size, fft_size)
+        # Expanded to every channel: a broadcast operand makes the multiply buffer internally
+        self._spectra = np.ascontiguousarray(np.broadcast_to(spectra, (len(spectra), channels, bins)))
+        self.partitions = len(self._spectra)
+        # Working buffers: everything process() touches is allocated here
+        # Two frames used alternately: copying between distinct arrays avoids
+        # the temporary NumPy makes for an overlapping in-place shift
+        self._frames = (np.zeros((channels, fft_size)), np.zeros((channels, fft_size)))
+        self._spectrum = np.zeros((channels, bins), dtype=np.complex128)
+        self._fdl = np.zeros((2 * self.partitions, channels, bins), dtype=np.complex64)
+        self._products = np.zeros((self.partitions, channels, bins), dtype=np.complex64)
+        self._sum = np.zeros((channels, bins), dtype=np.complex64)
+        self._result = np.zeros((channels, fft_size))
+        self._position = 0
+
+    @property
+    def latency(self) -> int:
+        """Samples of delay added on top of block buffering (always 0)"""
+        return 0
+
+    def process(self, block: np.ndarray, out: np.ndarray):
+        """Convolve one block, writing the wet signal into ``out``"""
+        n = self.block_size
+        previous, frame = self._frames
+        self._frames = (frame, previous)
+        # Overlap-save input: previous block followed by this one
+        frame[:, :n] = previous[:, n:]
+        frame[:, n:] = block
+        rfft_into(frame, self._spectrum)
+
+        p = self.partitions
+        position = self._position = (self._position - 1) % p
+        self._fdl[position] = self._spectrum
+        self._fdl[position + p] = self._spectrum
+
+        np.multiply(self._spectra, self._fdl[position:position + p], out=self._products)
+        np.sum(self._products, axis=0, out=self._sum)
+        self._spectrum[...] = self._sum
+        irfft_into(self._spectrum, self._result)
+        out[...] = self._result[:, n:]
+
+    def reset(self):
+        for frame in self._frames:
+            frame.fill(0.0)
+        self._fdl.fill(0.0)
+        self._position = 0
+
+
+class ConvolverNode(Node):
+    """Graph node running a UniformPartitionedConvolver on its input"""
+
+    def __init__(self, ir: np.ndarray, channels: Optional[int] = None):
+        super().__init__(channels)
+        self.ir = ir
+        self.convolver = None
+
+    def prepare(self, settings: BlockSettings, input_channels: Sequence[int]):
+        check_broadcast(self, settings, input_channels)
+        self.convolver = UniformPartitionedConvolver(self.ir, settings.block_size,
+                                                     self.channels or settings.channels)
+
+    def process(self, inputs, out):
+        self.convolver.process(inputs[0], out)
+
+    def reset(self):
+        if self.convolver:
+            self.convolver.reset()
@@ -0,0 +1,232 @@
+"""
+Multichannel biquad (SOS) filter bank with persistent state
+
+A bank is one cascade of second-order sections per channel, given as
+SciPy-style ``sos`` rows [b0, b1, b2, a0, a1, a2]: shaped (sections, 6)
+to share one cascade across channels, or (channels, sections, 6) for a
+different cascade on each. Designs from scipy.signal (iirfilter,
+butter(..., output='sos'), ...) can be passed straight in. Filter state
+(transposed direct form II, two values per section) is kept between
+blocks, so consecutive blocks filter exactly like one long signal.
+
+Each block is filtered by a single kernel call for all channels and
+sections:
+
+- With numba installed, a compiled loop over channels, samples and
+  sections, O(channels · sections · frames).
+- Without it, an exact block state-space form: the whole cascade over
+  one block is y = x·T + z·M and z' = x·B + z·A, with the matrices
+  worked out once per coefficient set, so a block is four (batched)
+  matrix products with no Python-level per-sample loop.
+
+set_sos() swaps coefficients without clicks: for one block the old and
+new cascades both run from the same state and the output is crossfaded
+from old to new with a raised-cosine ramp.
+"""
+
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .graph import BlockSettings, Node, check_broadcast
+
+# Pass-through section used to pad shorter cascades
+IDENTITY_SECTION = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def _sos_kernel(sos, x, zi, out):
+    """Filter (channels, frames) x through per-channel SOS cascades, updating zi in place"""
+    channels, frames = x.shape
+    sections = sos.shape[1]
+    for c in range(channels):
+        for n in range(frames):
+            v = x[c, n]
+            for s in range(sections):
+                y = sos[c, s, 0] * v + zi[c, s, 0]
+                zi[c, s, 0] = sos[c, s, 1] * v - sos[c, s, 4] * y + zi[c, s, 1]
+                zi[c, s, 1] = sos[c, s, 2] * v - sos[c, s, 5] * y
+                v = y
+            out[c, n] = v
+
+
+def compiled_kernel():
+    """The numba-compiled SOS kernel, or None if numba is not installed"""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True, nogil=True)(_sos_kernel)
+
+
+def normalize_sos(sos: np.ndarray, channels: int, sections: Optional[int] = None) -> np.ndarray:
+    """Return float64 (channels, sections, 6) coefficients with a0 == 1"""
+    sos = np.asarray(sos, dtype=np.float64)
+    if sos.ndim == 2:
+        sos = np.broadcast_to(sos, (channels,) + sos.shape)
+    if sos.ndim != 3 or sos.shape[0] != channels or sos.shape[2] != 6:
+        raise ValueError(f"sos must be (sections, 6) or ({channels}, sections, 6), got {sos.shape}")
+    sections = sections or sos.shape[1]
+    if sos.shape[1] > sections:
+        raise ValueError(f"sos has {sos.shape[1]} sections, this bank holds {sections}")
+    if np.any(sos[:, :, 3] == 0):
+        raise ValueError("sos has a section with a0 == 0")
+    padded = np.empty((channels, sections, 6))
+    padded[:] = IDENTITY_SECTION
+    padded[:, :sos.shape[1]] = sos / sos[:, :, 3:4]
+    return padded
+
+
+class BlockMatrices(NamedTuple):
+    """State-space form of a cascade over one block, laid out for row vectors"""
+    input_to_output: np.ndarray    # (channels, frames, frames)
+    state_to_output: np.ndarray    # (channels, 2 * sections, frames)
+    input_to_state: np.ndarray     # (channels, frames, 2 * sections)
+    state_to_state: np.ndarray     # (channels, 2 * sections, 2 * sections)
+
+
+def block_matrices(sos: np.ndarray, frames: int) -> BlockMatrices:
+    """Derive BlockMatrices for normalized (channels, sections, 6) coefficients
+
+    Simulates one impulse with zero state, and zero input from each unit
+    state, for all channels at once.
+    """
+    channels, sections, _ = sos.shape
+    order = 2 * sections
+    probes = 1 + order
+    zi = np.zeros((probes, channels, sections, 2))
+    zi[1:].reshape(order, channels, order)[np.arange(order), :, np.arange(order)] = 1.0
+    x = np.zeros((probes, channels, frames))
+    x[0, :, 0] = 1.0
+    y = np.zeros((probes, channels, frames))
+    impulse_states = np.zeros((frames, channels, order))
+
+    b0, b1, b2, a1, a2 = (sos[:, :, i] for i in (0, 1, 2, 4, 5))
+    for n in range(frames):
+        v = x[:, :, n]
+        for s in range(sections):
+            out = b0[:, s] * v + zi[:, :, s, 0]
+            zi[:, :, s, 0] = b1[:, s] * v - a1[:, s] * out + zi[:, :, s, 1]
+            zi[:, :, s, 1] = b2[:, s] * v - a2[:, s] * out
+            v = out
+        y[:, :, n] = v
+        impulse_states[n] = zi[0].reshape(channels, order)
+
+    h = y[0]
+    lags = np.arange(frames)[None, :] - np.arange(frames)[:, None]     # lags[m, n] = n - m
+    input_to_output = np.where(lags >= 0, h[:, np.clip(lags, 0, None)], 0.0)
+    state_to_output = y[1:].transpose(1, 0, 2)
+    # An impulse at sample m leaves the state the impulse response has after frames - m samples
+    input_to_state = impulse_states[::-1].transpose(1, 0, 2)
+    state_to_state = zi[1:].reshape(order, channels, order).transpose(1, 0, 2)
+    return BlockMatrices(np.ascontiguousarray(input_to_output), np.ascontiguousarray(state_to_output),
+                         np.ascontiguousarray(input_to_state), np.ascontiguousarray(state_to_state))
+
+
+class SOSFilterBank:
+    """Per-channel SOS cascades run over (channels, block_size) blocks
+
+    ``use_numba`` None picks numba when it is installed; True requires it;
+    False always uses the NumPy block state-space path.
+    """
+
+    def __init__(self, sos: np.ndarray, channels: int, block_size: int, use_numba: Optional[bool] = None):
+        self.channels = channels
+        self.block_size = block_size
+        self._kernel = compiled_kernel() if use_numba is not False else None
+        if use_numba and self._kernel is None:
+            raise ImportError("numba is not installed")
+
+        sos = normalize_sos(sos, channels)
+        self.sections = sos.shape[1]
+        order = 2 * self.sections
+        self._active = self._pending = self._coefficients(sos)
+        self.zi = np.zeros((channels, self.sections, 2))
+        self._fade_zi = np.zeros_like(self.zi)
+        self._input = np.zeros((channels, block_size), dtype=np.float32)
+        self._faded = np.zeros((channels, block_size), dtype=np.float32)
+        self._ramp = (0.5 - 0.5 * np.cos(np.pi * (np.arange(block_size) + 0.5) / block_size)).astype(np.float32)
+        # Block state-space work buffers, as (channels, 1, n) row vectors
+        self._x = np.zeros((channels, 1, block_size))
+        self._y = np.zeros((channels, 1, block_size))
+        self._y_state = np.zeros((channels, 1, block_size))
+        self._z = np.zeros((channels, 1, order))
+        self._z_state = np.zeros((channels, 1, order))
+
+    def _coefficients(self, sos: np.ndarray):
+        """What process() needs for one coefficient set"""
+        if self._kernel is not None:
+            return sos
+        return block_matrices(sos, self.block_size)
+
+    def set_sos(self, sos: np.ndarray):
+        """Switch to new coefficients, crossfading over the next block
+
+        Safe to call from a control thread; the audio thread picks the
+        new set up at the start of its next block.
+        """
+        self._pending = self._coefficients(normalize_sos(sos, self.channels, self.sections))
+
+    def _run(self, coefficients, block: np.ndarray, zi: np.ndarray, out: np.ndarray):
+        if self._kernel is not None:
+            self._kernel(coefficients, block, zi, out)
+            return
+        z = zi.reshape(self.channels, 1, -1)
+        self._x[:, 0, :] = block
+        np.matmul(self._x, coefficients.input_to_output, out=self._y)
+        np.matmul(z, coefficients.state_to_output, out=self._y_state)
+        np.add(self._y, self._y_state, out=self._y)
+        np.matmul(self._x, coefficients.input_to_state, out=self._z)
+        np.matmul(z, coefficients.state_to_state, out=self._z_state)
+        np.add(self._z, self._z_state, out=z)
+        out[...] = self._y[:, 0, :]
+
+    def process(self, block: np.ndarray, out: np.ndarray):
+        """Filter one block into ``out``"""
+        if block.shape[0] != self.channels:
+            # Mono input feeding every channel's cascade
+            np.copyto(self._input, block)
+            block = self._input
+        pending = self._pending
+        if pending is self._active:
+            self._run(self._active, block, self.zi, out)
+            return
+
+        # Run old and new coefficients from the same state and crossfade the outputs
+        np.copyto(self._fade_zi, self.zi)
+        self._run(self._active, block, self.zi, out)
+        self._run(pending, block, self._fade_zi, self._faded)
+        np.subtract(self._faded, out, out=self._faded)
+        np.multiply(self._faded, self._ramp, out=self._faded)
+        np.add(out, self._faded, out=out)
+        self.zi, self._fade_zi = self._fade_zi, self.zi
+        self._active = pending
+
+    def reset(self):
+        self.zi.fill(0.0)
+
+
+class FilterBankNode(Node):
+    """Graph node running an SOSFilterBank on its input"""
+
+    def __init__(self, sos: np.ndarray, channels: Optional[int] = None, use_numba: Optional[bool] = None):
+        super().__init__(channels)
+        self.sos = sos
+        self.use_numba = use_numba
+        self.bank = None
+
+    def prepare(self, settings: BlockSettings, input_channels: Sequence[int]):
+        check_broadcast(self, settings, input_channels)
+        self.bank = SOSFilterBank(self.sos, self.channels or settings.channels, settings.block_size,
+                                  self.use_numba)
+
+    def set_sos(self, sos: np.ndarray):
+        self.sos = sos
+        if self.bank:
+            self.bank.set_sos(sos)
+
+    def process(self, inputs, out):
+        self.bank.process(inputs[0], out)
+
+    def reset(self):
+        if self.bank:
+            self.bank.reset()
@@ -0,0 +1,263 @@
+"""
+Block-based DSP node graph
+
+Nodes are connected into a graph which is compiled once into a flat,
+topologically sorted schedule. Compiling allocates every buffer the graph
+will ever use: one float32 output block per node, shaped (channels,
+block_size), plus a shared silent block for unconnected inputs. Each
+node's inputs are references to its upstream nodes' output buffers, so
+no audio is copied between nodes.
+
+Processing is pull-based: only nodes that feed the output node are
+scheduled, and CompiledGraph.process() runs them in order and returns the
+output node's buffer. Nodes write into the buffers they are handed with
+NumPy ``out=`` operations, so the steady-state process call allocates no
+arrays.
+
+    settings = BlockSettings.from_config()
+    graph = DSPGraph(settings)
+    sim = graph.add(InputNode(), 'sim')
+    engine = graph.add(GainNode(0.5), 'engine')
+    graph.connect(sim, engine)
+    compiled = graph.compile(output=engine)
+    block = compiled.process(sim_block)   # (channels, block_size) float32
+    compiled.close()                      # stops node threads, e.g. tail convolvers
+"""
+
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_CONFIG = "config/config.yaml"
+
+
+class BlockSettings(NamedTuple):
+    sample_rate: int = 48000
+    block_size: int = 512
+    channels: int = 8
+    max_latency_ms: float = 20.0
+
+    @property
+    def block_period_ms(self) -> float:
+        """Wall-clock time available to process one block"""
+        return 1000.0 * self.block_size / self.sample_rate
+
+    @classmethod
+    def from_config(cls, config_path: str = DEFAULT_CONFIG) -> 'BlockSettings':
+        """Read audio.* and realtime.max_latency_ms from the project config"""
+        import yaml
+
+        with open(config_path, 'r') as f:
+            config = yaml.safe_load(f) or {}
+        audio = config.get('audio') or {}
+        realtime = config.get('realtime') or {}
+        defaults = cls()
+        return cls(int(audio.get('sample_rate', defaults.sample_rate)),
+                   int(audio.get('buffer_size', defaults.block_size)),
+                   int(audio.get('channels', defaults.channels)),
+                   float(realtime.get('max_latency_ms', defaults.max_latency_ms)))
+
+
+class Node:
+    """A processing step with ``num_inputs`` input blocks and one output block
+
+    Subclasses override process() and, if they keep state, prepare() and
+    reset(); nodes that own threads or other resources also override
+    close(). ``channels`` is the output channel count (None: the graph's).
+    """
+
+    num_inputs = 1
+
+    def __init__(self, channels: Optional[int] = None):
+        self.channels = channels
+
+    def prepare(self, settings: BlockSettings, input_channels: Sequence[int]):
+        """Allocate any state buffers; called once when the graph is compiled"""
+
+    def process(self, inputs: Tuple[np.ndarray, ...], out: np.ndarray):
+        """Compute one block into ``out`` without allocating"""
+        raise NotImplementedError
+
+    def reset(self):
+        """Clear internal state (delay lines, filter memory) between runs"""
+
+    def close(self):
+        """Release threads and other resources; the node is not processed again"""
+
+
+def check_broadcast(node: Node, settings: BlockSettings, input_channels: Sequence[int]):
+    """Raise unless every input is mono or matches the node's output channel count"""
+    channels = node.channels or settings.channels
+    for port, count in enumerate(input_channels):
+        if count not in (1, channels):
+            raise ValueError(f"{type(node).__name__} input {port} has {count} channels, expected 1 or {channels}")
+
+
+class InputNode(Node):
+    """Graph input; CompiledGraph.process() copies caller blocks in here"""
+
+    num_inputs = 0
+
+    def process(self, inputs, out):
+        pass
+
+
+class GainNode(Node):
+    """Scale a block by a constant gain"""
+
+    def __init__(self, gain: float = 1.0, channels: Optional[int] = None):
+        super().__init__(channels)
+        self.gain = gain
+
+    def prepare(self, settings, input_channels):
+        check_broadcast(self, settings, input_channels)
+
+    def process(self, inputs, out):
+        np.multiply(inputs[0], self.gain, out=out)
+
+
+class MixNode(Node):
+    """Sum several blocks; mono inputs are added to every channel"""
+
+    def __init__(self, num_inputs: int = 2, channels: Optional[int] = None):
+        super().__init__(channels)
+        self.num_inputs = num_inputs
+
+    def prepare(self, settings, input_channels):
+        check_broadcast(self, settings, input_channels)
+
+    def process(self, inputs, out):
+        np.copyto(out, inputs[0])
+        for block in inputs[1:]:
+            np.add(out, block, out=out)
+
+
+class DSPGraph:
+    """Nodes and connections, compiled into a CompiledGraph for processing"""
+
+    def __init__(self, settings: BlockSettings = None):
+        self.settings = settings or BlockSettings()
+        self.nodes: Dict[str, Node] = {}
+        self.edges: Dict[Tuple[str, int], str] = {}    # (destination, input port) -> source
+
+    def _name(self, node) -> str:
+        name = node if isinstance(node, str) else next((n for n, v in self.nodes.items() if v is node), None)
+        if name not in self.nodes:
+            raise ValueError(f"Node {node!r} is not part of this graph")
+        return name
+
+    def add(self, node: Node, name: str = None) -> str:
+        """Add a node and return its name"""
+        name = name or f"{type(node).__name__}_{len(self.nodes)}"
+        if name in self.nodes:
+            raise ValueError(f"Duplicate node name: {name}")
+        self.nodes[name] = node
+        return name
+
+    def connect(self, source, destination, port: int = 0):
+        """Feed the output of ``source`` into input ``port`` of ``destination``"""
+        source, destination = self._name(source), self._name(destination)
+        if not 0 <= port < self.nodes[destination].num_inputs:
+            raise ValueError(f"{destination} has no input port {port}")
+        self.edges[(destination, port)] = source
+
+    def _upstream(self, output: str) -> List[str]:
+        """Topologically sorted nodes that the output depends on (Kahn's algorithm)"""
+        sources: Dict[str, List[str]] = {}
+        for (destination, _), source in self.edges.items():
+            sources.setdefault(destination, []).append(source)
+        needed = {output}
+        stack = [output]
+        while stack:
+            for source in sources.get(stack.pop(), ()):
+                if source not in needed:
+                    needed.add(source)
+                    stack.append(source)
+
+        dependents: Dict[str, List[str]] = {name: [] for name in needed}
+        pending = {name: 0 for name in needed}
+        for (destination, _), source in self.edges.items():
+            if destination in needed:
+                dependents[source].append(destination)
+                pending[destination] += 1
+
+        # Insertion order breaks ties, so schedules are stable across compiles
+        ready = deque(name for name in self.nodes if name in needed and not pending[name])
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in dependents[name]:
+                pending[dependent] -= 1
+                if not pending[dependent]:
+                    ready.append(dependent)
+        if len(order) != len(needed):
+            cycle = sorted(name for name in needed if pending[name])
+            raise ValueError(f"DSP graph has a cycle through: {', '.join(cycle)}")
+        return order
+
+    def compile(self, output) -> 'CompiledGraph':
+        """Schedule the nodes feeding ``output`` and allocate all their buffers"""
+        output = self._name(output)
+        settings = self.settings
+        order = self._upstream(output)
+        silence = np.zeros((settings.channels, settings.block_size), dtype=np.float32)
+        silence.flags.writeable = False
+
+        buffers: Dict[str, np.ndarray] = {}
+        steps = []
+        for name in order:
+            node = self.nodes[name]
+            inputs = tuple(buffers[self.edges[(name, port)]] if (name, port) in self.edges else silence
+                           for port in range(node.num_inputs))
+            node.prepare(settings, [block.shape[0] for block in inputs])
+            channels = node.channels or settings.channels
+            buffers[name] = np.zeros((channels, settings.block_size), dtype=np.float32)
+            steps.append((node.process, inputs, buffers[name]))
+
+        inputs = [(name, buffers[name]) for name in order if isinstance(self.nodes[name], InputNode)]
+        return CompiledGraph(settings, [self.nodes[name] for name in order], steps, inputs, buffers[output])
+
+
+class CompiledGraph:
+    """A fixed schedule over preallocated buffers; see DSPGraph.compile"""
+
+    def __init__(self, settings: BlockSettings, nodes: List[Node], steps, inputs, output: np.ndarray):
+        self.settings = settings
+        self.nodes = nodes
+        self.input_names = [name for name, _ in inputs]
+        self._steps = steps
+        self._input_buffers = [buffer for _, buffer in inputs]
+        self.output = output
+
+    def process(self, *blocks: np.ndarray) -> np.ndarray:
+        """Run one block through the graph
+
+        ``blocks`` are copied into the input nodes in input_names order.
+        The returned array is the graph's own output buffer and is
+        overwritten by the next call.
+        """
+        for buffer, block in zip(self._input_buffers, blocks):
+            np.copyto(buffer, block)
+        for process, inputs, out in self._steps:
+            process(inputs, out)
+        return self.output
+
+    def reset(self):
+        """Clear every node's state and zero all buffers"""
+        for node in self.nodes:
+            node.reset()
+        for _, _, out in self._steps:
+            out.fill(0.0)
+
+    def close(self):
+        """Close every node; call when the graph is discarded"""
+        for node in self.nodes:
+            node.close()
+
+    def __enter__(self) -> 'CompiledGraph':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
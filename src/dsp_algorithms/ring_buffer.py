@@ -0,0 +1,205 @@
+"""
+Single-producer/single-consumer ring buffer of audio frames
+
+Frames are stored channel-first, (channels, capacity) float32, the same
+layout as DSPGraph blocks. The write and read positions are 64-bit frame
+counters that only ever grow; a counter modulo capacity is the slot, and
+write - read is the fill level, so full and empty are never ambiguous.
+
+Each side owns one counter. The producer fills slots and only then
+publishes its new write counter; the consumer copies frames out and only
+then publishes its new read counter. A counter is one aligned int64
+store, so the other side sees either the old or the new value, never a
+torn one, and it never sees slots before they are published. The two
+counters sit on separate cache lines so the two sides do not contend.
+No locks are taken, and reads and writes copy into caller-owned arrays,
+so neither side allocates.
+
+write_views()/read_views() expose the free or filled region as at most
+two NumPy views (two when the region wraps past the end), so callers can
+render or consume in place and then commit(). A shared ring cannot be
+closed while any of those views is still alive.
+
+With ``shared=True`` the buffer and counters live in a named
+multiprocessing.shared_memory segment, and another process can open the
+same ring with RingBuffer.attach(name):
+
+    ring = RingBuffer(channels=8, capacity=4096, shared=True)
+    ...                                       # in the device process
+    ring = RingBuffer.attach(name)
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from .graph import BlockSettings, Node
+
+CACHE_LINE = 64
+_MAGIC = 0x52494E47        # 'RING'
+# int64 header slots, one cache line apart: layout, then each side's counter
+_LAYOUT, _WRITE, _READ = 0, CACHE_LINE // 8, 2 * CACHE_LINE // 8
+_HEADER_BYTES = 3 * CACHE_LINE
+
+Views = Tuple[np.ndarray, np.ndarray]
+
+
+class RingBuffer:
+    """Lock-free SPSC FIFO of (channels, frames) float32 audio"""
+
+    def __init__(self, channels: int, capacity: int, shared: bool = False, name: Optional[str] = None,
+                 _shm=None):
+        self.channels = channels
+        self.capacity = capacity
+        frame_bytes = channels * capacity * np.dtype(np.float32).itemsize
+        self._shm = _shm
+        self._owner = _shm is None and shared
+        if self._owner:
+            from multiprocessing import shared_memory
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=_HEADER_BYTES + frame_bytes)
+        if self._shm is not None:
+            memory = self._shm.buf
+        else:
+            memory = np.zeros(_HEADER_BYTES + frame_bytes, dtype=np.uint8).data
+
+        self._header = np.frombuffer(memory, dtype=np.int64, count=_HEADER_BYTES // 8)
+        self._data = np.frombuffer(memory, dtype=np.float32, count=channels * capacity,
+                                   offset=_HEADER_BYTES).reshape(channels, capacity)
+        if _shm is None:
+            self._header[_LAYOUT:_LAYOUT + 3] = (_MAGIC, channels, capacity)
+
+    @classmethod
+    def attach(cls, name: str) -> 'RingBuffer':
+        """Open a shared ring created in another process"""
+        import sys
+        from multiprocessing import resource_tracker, shared_memory
+        # Only the creating process may unlink the segment, so an attached one must not
+        # leave it registered with a resource tracker that unlinks it at exit
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        magic, channels, capacity = np.frombuffer(shm.buf, dtype=np.int64, count=3)
+        if magic != _MAGIC:
+            shm.close()
+            raise ValueError(f"Shared memory segment {name!r} is not a ring buffer")
+        return cls(int(channels), int(capacity), _shm=shm)
+
+    @property
+    def name(self) -> Optional[str]:
+        """Shared memory segment name, or None for a process-local ring"""
+        return self._shm.name if self._shm is not None else None
+
+    def readable(self) -> int:
+        """Frames available to the consumer"""
+        return int(self._header[_WRITE] - self._header[_READ])
+
+    def writable(self) -> int:
+        """Frames the producer can write without overrunning the consumer"""
+        return self.capacity - self.readable()
+
+    def _views(self, start: int, frames: int) -> Views:
+        start %= self.capacity
+        first = min(frames, self.capacity - start)
+        return self._data[:, start:start + first], self._data[:, :frames - first]
+
+    # Producer side
+
+    def write_views(self, frames: int) -> Views:
+        """Up to ``frames`` free slots as two views; fill them, then commit_write()
+
+        Drop the views before close(); a shared ring cannot be closed while they exist.
+        """
+        return self._views(int(self._header[_WRITE]), min(frames, self.writable()))
+
+    def commit_write(self, frames: int):
+        """Publish ``frames`` slots filled through write_views()"""
+        self._header[_WRITE] += frames
+
+    def write(self, block: np.ndarray) -> int:
+        """Copy as much of a (channels, frames) block as fits; return frames written"""
+        first, second = self.write_views(block.shape[-1])
+        split = first.shape[1]
+        first[...] = block[:, :split]
+        second[...] = block[:, split:split + second.shape[1]]
+        written = split + second.shape[1]
+        self.commit_write(written)
+        return written
+
+    # Consumer side
+
+    def read_views(self, frames: int) -> Views:
+        """Up to ``frames`` filled slots as two views; use them, then commit_read()
+
+        Drop the views before close(); a shared ring cannot be closed while they exist.
+        """
+        return self._views(int(self._header[_READ]), min(frames, self.readable()))
+
+    def commit_read(self, frames: int):
+        """Release ``frames`` slots consumed through read_views()"""
+        self._header[_READ] += frames
+
+    def read(self, out: np.ndarray) -> int:
+        """Copy up to out.shape[-1] frames into ``out``; return frames read"""
+        first, second = self.read_views(out.shape[-1])
+        split = first.shape[1]
+        out[:, :split] = first
+        out[:, split:split + second.shape[1]] = second
+        count = split + second.shape[1]
+        self.commit_read(count)
+        return count
+
+    def read_block(self, out: np.ndarray) -> bool:
+        """Fill ``out`` completely, or read nothing and return False"""
+        if self.readable() < out.shape[-1]:
+            return False
+        self.read(out)
+        return True
+
+    def close(self):
+        """Detach from shared memory; the creating process also unlinks it
+
+        Raises BufferError if views returned by read_views() or
+        write_views() are still referenced. The ring cannot be used after
+        that; delete the views and call close() again to finish.
+        """
+        if self._shm is None:
+            return
+        # Our own views into the segment must be gone before it can be closed
+        self._header = self._data = None
+        try:
+            self._shm.close()
+        except BufferError:
+            raise BufferError("Cannot close the ring while views from read_views()/write_views() "
+                              "are still referenced; delete them first") from None
+        if self._owner:
+            from multiprocessing import resource_tracker
+            # An attach() in a child sharing our tracker drops the record unlink() removes
+            resource_tracker.register(self._shm._name, 'shared_memory')
+            self._shm.unlink()
+        self._shm = None
+
+
+class RingReaderNode(Node):
+    """Graph input that pulls each block from a RingBuffer
+
+    On an underrun the block is silence and ``underruns`` is incremented;
+    the frames that were available stay queued for the next block.
+    """
+
+    num_inputs = 0
+
+    def __init__(self, ring: RingBuffer):
+        super().__init__(ring.channels)
+        self.ring = ring
+        self.underruns = 0
+
+    def prepare(self, settings: BlockSettings, input_channels: Sequence[int]):
+        if settings.block_size > self.ring.capacity:
+            raise ValueError(f"Ring capacity {self.ring.capacity} is smaller than one block")
+
+    def process(self, inputs, out):
+        if not self.ring.read_block(out):
+            out.fill(0.0)
+            self.underruns += 1